@@ -1,6 +1,8 @@
 from django.db import models
 from ckeditor.fields import RichTextField
 
+from apps.core.images import RenditionsMixin
+
 
 class OrganizationInfo(models.Model):
     """Organization mission, vision, objectives"""
@@ -17,8 +19,9 @@ class OrganizationInfo(models.Model):
         return 'Organization Info'
 
 
-class Founder(models.Model):
+class Founder(RenditionsMixin):
     """Founder details"""
+    rendition_fields = ('photo',)
     name = models.CharField(max_length=200)
     title = models.CharField(max_length=200, blank=True)
     photo = models.ImageField(upload_to='founders/', blank=True, null=True)
@@ -0,0 +1,247 @@
+"""Streaming CSV and vCard exports of the member directory and the application tables.
+
+Rows are read with QuerySet.iterator() as value tuples (no model instances)
+and written in chunks of CHUNK_ROWS, so an export of any size holds one chunk
+in memory and starts sending at once instead of running into worker timeouts.
+"""
+import csv
+import datetime
+import decimal
+import io
+
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.core.models import SiteIdentity
+from apps.membership.models import MembershipApplication, VolunteerApplication
+from apps.team.models import Member
+from apps.team.search import search_members
+
+CHUNK_ROWS = 500
+# Cells Excel would evaluate as formulas (OWASP CSV injection); exported text comes partly from public forms
+_FORMULA_START = ('=', '+', '-', '@', '\t', '\r')
+
+
+class Dataset:
+    """An exportable table: CSV columns (name -> ORM lookup), filters and vCard properties."""
+    model = None
+    filename = ''
+    columns = {}
+    ordering = ()
+    vcard_columns = ()
+
+    def queryset(self, params):
+        return self.model.objects.order_by(*self.ordering)
+
+    def vcard_builder(self, request):
+        """Function turning one row of vcard_columns (a dict) into vCard properties [(name, value)].
+
+        Anything that is the same for every row is looked up here, once per export.
+        """
+        raise NotImplementedError
+
+
+class MemberDataset(Dataset):
+    """Team members, filtered like cms_member_management (?role=, ?type=board|volunteer)."""
+    model = Member
+    filename = 'members'
+    columns = {
+        'member_id': 'member_id', 'name': 'name', 'role': 'role', 'member_type': 'member_type',
+        'chapter': 'chapter__name', 'category': 'category', 'location': 'location', 'email': 'email',
+        'phone': 'phone', 'education': 'education', 'specialization': 'specialization',
+        'join_year': 'join_year', 'date_of_issue': 'date_of_issue', 'facebook_url': 'facebook_url',
+        'instagram_url': 'instagram_url', 'linkedin_url': 'linkedin_url', 'is_active': 'is_active',
+        'order': 'order', 'bio': 'bio',
+    }
+    ordering = ('order', 'name', 'pk')
+    vcard_columns = ('pk', 'name', 'role', 'member_type', 'member_id', 'email', 'phone', 'chapter__name')
+
+    def queryset(self, params):
+        members = super().queryset(params)
+        if params.get('role'):
+            members = search_members(members, params['role'], columns=('role',), rank=False)
+        if params.get('type') in ('board', 'volunteer'):
+            members = members.filter(member_type=params['type'])
+        return members
+
+    def vcard_builder(self, request):
+        org = SiteIdentity.get().site_title
+        # Detail URL split around the pk: reverse() per row would dominate a large export
+        head, _pk, tail = request.build_absolute_uri(reverse('member_detail', args=[0])).rpartition('0')
+
+        def build(row):
+            kind = 'Board Member' if row['member_type'] == 'board' else 'Volunteer'
+            return [
+                ('FN', row['name']),
+                ('N', ['', row['name'], '', '', '']),
+                ('TITLE', ' · '.join(filter(None, [kind, row['role']]))),
+                ('ORG', [org, row['chapter__name'] or '']),
+                ('EMAIL;TYPE=INTERNET', row['email']),
+                ('TEL', row['phone']),
+                ('URL', f'{head}{row["pk"]}{tail}'),
+                ('NOTE', row['member_id']),
+            ]
+        return build
+
+
+class ApplicationDataset(Dataset):
+    """Application submissions, newest first (?status=pending|approved|rejected)."""
+    ordering = ('-submitted_at', '-pk')
+
+    def queryset(self, params):
+        applications = super().queryset(params)
+        statuses = {value for value, _label in self.model._meta.get_field('status').choices}
+        if params.get('status') in statuses:
+            applications = applications.filter(status=params['status'])
+        return applications
+
+
+class VolunteerApplicationDataset(ApplicationDataset):
+    model = VolunteerApplication
+    filename = 'volunteer-applications'
+    columns = {
+        'name': 'name', 'email': 'email', 'contact_number': 'contact_number', 'location': 'location',
+        'availability': 'availability', 'past_experience': 'past_experience', 'status': 'status',
+        'submitted_at': 'submitted_at',
+    }
+    vcard_columns = ('name', 'email', 'contact_number', 'location', 'status')
+
+    def vcard_builder(self, request):
+        return self._vcard
+
+    @staticmethod
+    def _vcard(row):
+        return [
+            ('FN', row['name']),
+            ('N', ['', row['name'], '', '', '']),
+            ('EMAIL;TYPE=INTERNET', row['email']),
+            ('TEL', row['contact_number']),
+            ('ADR', ['', '', '', row['location'], '', '', '']),
+            ('NOTE', f'Volunteer application ({row["status"]})'),
+        ]
+
+
+class MembershipApplicationDataset(ApplicationDataset):
+    model = MembershipApplication
+    filename = 'membership-applications'
+    columns = {
+        'name': 'name', 'email': 'email', 'phone': 'phone', 'member_type': 'member_type',
+        'payment_method': 'payment_method', 'payment_reference': 'payment_reference',
+        'amount_paid': 'amount_paid', 'status': 'status', 'submitted_at': 'submitted_at',
+    }
+    vcard_columns = ('name', 'email', 'phone', 'member_type', 'status')
+
+    def vcard_builder(self, request):
+        return self._vcard
+
+    @staticmethod
+    def _vcard(row):
+        return [
+            ('FN', row['name']),
+            ('N', ['', row['name'], '', '', '']),
+            ('EMAIL;TYPE=INTERNET', row['email']),
+            ('TEL', row['phone']),
+            ('NOTE', f'Membership application: {row["member_type"]} ({row["status"]})'),
+        ]
+
+
+DATASETS = {
+    'members': MemberDataset(),
+    'volunteers': VolunteerApplicationDataset(),
+    'memberships': MembershipApplicationDataset(),
+}
+
+
+def parse_columns(dataset, text):
+    """Column names from a comma-separated ?columns= value (all columns when empty).
+
+    Raises ValueError naming any unknown column.
+    """
+    names = [name.strip() for name in (text or '').split(',') if name.strip()]
+    unknown = [name for name in names if name not in dataset.columns]
+    if unknown:
+        raise ValueError(f'Unknown column(s): {", ".join(unknown)}. Allowed: {", ".join(dataset.columns)}.')
+    return names or list(dataset.columns)
+
+
+def _cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime.datetime):
+        return timezone.localtime(value).strftime('%Y-%m-%d %H:%M') if timezone.is_aware(value) else value.isoformat(' ')
+    if isinstance(value, (bool, int, float, decimal.Decimal)):
+        return value
+    value = str(value)
+    # Digits after + or - are no exemption: "+1+cmd|..." and "+977-1-..." are evaluated too
+    if value.startswith(_FORMULA_START):
+        return "'" + value
+    return value
+
+
+def _chunks(rows, format_row):
+    """Join formatted rows into strings of CHUNK_ROWS rows each."""
+    chunk = []
+    for row in rows:
+        chunk.append(format_row(row))
+        if len(chunk) >= CHUNK_ROWS:
+            yield ''.join(chunk)
+            chunk = []
+    if chunk:
+        yield ''.join(chunk)
+
+
+def stream_csv(dataset, queryset, columns):
+    """Yield the CSV export of queryset (header first) in chunks of text."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def format_row(row):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow([_cell(value) for value in row])
+        return buffer.getvalue()
+
+    # Excel only reads a CSV as UTF-8 when it starts with a byte order mark
+    yield '\ufeff' + format_row(columns)
+    rows = queryset.values_list(*(dataset.columns[name] for name in columns)).iterator(chunk_size=2000)
+    yield from _chunks(rows, format_row)
+
+
+def _vcard_text(value):
+    if isinstance(value, list):
+        return ';'.join(_vcard_text(part) for part in value)
+    return (str(value).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def _fold(line):
+    """Fold a content line at 75 octets (RFC 6350 3.2) without splitting UTF-8 sequences."""
+    if len(line.encode()) <= 75:
+        return line + '\r\n'
+    parts, current, size = [], '', 0
+    for ch in line:
+        width = len(ch.encode())
+        if size + width > 75:
+            parts.append(current)
+            current, size = ' ', 1
+        current += ch
+        size += width
+    parts.append(current)
+    return '\r\n'.join(parts) + '\r\n'
+
+
+def stream_vcards(dataset, queryset, request):
+    """Yield one vCard 3.0 per row of queryset, in chunks of text."""
+    build = dataset.vcard_builder(request)
+
+    def format_row(values):
+        row = dict(zip(dataset.vcard_columns, values))
+        lines = ['BEGIN:VCARD', 'VERSION:3.0']
+        for name, value in build(row):
+            if value and (not isinstance(value, list) or any(value)):
+                lines.append(f'{name}:{_vcard_text(value)}')
+        lines.append('END:VCARD')
+        return ''.join(_fold(line) for line in lines)
+
+    rows = queryset.values_list(*dataset.vcard_columns).iterator(chunk_size=2000)
+    yield from _chunks(rows, format_row)
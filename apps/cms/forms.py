@@ -1,4 +1,5 @@
 from django import forms
+from django.core.validators import FileExtensionValidator
 from apps.core.models import HeroBanner, HomeContent, AnnouncementPopup, GalleryImage, NavItem, SiteTheme, SiteIdentity
 from apps.about.models import OrganizationInfo, Founder, ChapterLocation, Achievement
 from apps.impact.models import ImpactStat
@@ -228,6 +229,15 @@ class MemberForm(forms.ModelForm):
         self.fields['location'].choices = choices
 
 
+class MemberImportForm(forms.Form):
+    file = forms.FileField(
+        validators=[FileExtensionValidator(['csv', 'xlsx'])],
+        widget=forms.FileInput(attrs={'accept': '.csv,.xlsx'}),
+        help_text='CSV (UTF-8) or Excel .xlsx; the first row names the columns.',
+    )
+    dry_run = forms.BooleanField(required=False, label='Check only (import nothing)')
+
+
 class TeamPageSettingsForm(forms.ModelForm):
     clear_watermark = forms.BooleanField(required=False, label='Remove background image (clear to default)')
 
@@ -28,8 +28,8 @@ def notify_volunteer(sender, instance, created, **kwargs):
             message=f'{instance.location} - Pending approval',
             link='/admin-login/members/',
         )
-    elif instance.status == 'approved':
-        # Create or update a public Member entry for approved volunteers
+    elif instance.status == 'approved' and instance.has_changed():
+        # Create or update a public Member entry for approved volunteers (on approval or when published fields change)
         member_defaults = {
             'name': instance.name,
             'role': 'Volunteer',
@@ -65,7 +65,7 @@ def notify_membership(sender, instance, created, **kwargs):
             message=f'{instance.get_member_type_display()} - Pending approval',
             link='/admin-login/members/',
         )
-    elif instance.status == 'approved':
+    elif instance.status == 'approved' and instance.has_changed():
         # Map membership application to Volunteer member type
         member, created = Member.objects.update_or_create(
             email=instance.email,
@@ -92,7 +92,8 @@ def notify_membership(sender, instance, created, **kwargs):
 
 @receiver(post_save, sender=Donation)
 def notify_donation(sender, instance, created, **kwargs):
-    if created and instance.status == 'completed':
+    # On creation or when a pending payment is verified
+    if instance.status == 'completed' and instance.has_changed('status'):
         CMSNotification.objects.create(
             notification_type='payment_received',
             title=f'Donation received: NPR {instance.amount}',
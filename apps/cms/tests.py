@@ -0,0 +1,17 @@
+from django.test import SimpleTestCase
+
+from apps.cms.exports import _cell
+
+
+class CsvCellTests(SimpleTestCase):
+    """Exported text must never reach Excel as a formula."""
+
+    def test_formula_payloads_are_escaped(self):
+        for payload in ["+1+cmd|' /C calc'!A0", '-1+1', '=SUM(A1:A2)', '@SUM(A1)', '\t=1', '\r=1', '+977-1-4412345']:
+            with self.subTest(payload=payload):
+                self.assertEqual(_cell(payload), "'" + payload)
+
+    def test_plain_values_are_unchanged(self):
+        self.assertEqual(_cell('Sita Sharma'), 'Sita Sharma')
+        self.assertEqual(_cell(None), '')
+        self.assertEqual(_cell(-5), -5)
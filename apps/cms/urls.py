@@ -7,6 +7,7 @@ urlpatterns = [
     path('api/notifications/', views.cms_notifications_api, name='cms_notifications_api'),
     path('api/notifications/<int:pk>/read/', views.cms_notification_mark_read, name='cms_notification_mark_read'),
     path('api/notifications/read-all/', views.cms_notification_mark_all_read, name='cms_notification_mark_all_read'),
+    path('api/image-jobs/', views.cms_image_jobs_api, name='cms_image_jobs_api'),
     path('dashboard/', views.cms_dashboard, name='cms_dashboard'),
     path('home/', views.cms_home, name='cms_home'),
     path('home/banner/<int:pk>/edit/', views.cms_banner_edit, name='cms_banner_edit'),
@@ -36,6 +37,7 @@ urlpatterns = [
     path('contact/edit/', views.cms_contact_edit, name='cms_contact_edit'),
     path('members/', views.cms_members, name='cms_members'),
     path('members/<str:model_type>/<int:pk>/<str:action>/', views.cms_member_action, name='cms_member_action'),
+    path('exports/<str:dataset>.<str:fmt>', views.cms_export, name='cms_export'),
     path('donation/', views.cms_donation, name='cms_donation'),
     path('donation/tier/<int:pk>/edit/', views.cms_tier_edit, name='cms_tier_edit'),
     path('donation/tier/add/', views.cms_tier_edit, name='cms_tier_add'),
@@ -54,6 +56,7 @@ urlpatterns = [
     path('member-management/', views.cms_member_management, name='cms_member_management'),
     path('member-management/reorder/', views.cms_member_reorder, name='cms_member_reorder'),
     path('member-management/add/', views.cms_member_edit, name='cms_member_add'),
+    path('member-management/import/', views.cms_member_import, name='cms_member_import'),
     path('member-management/<int:pk>/edit/', views.cms_member_edit, name='cms_member_edit'),
     path('member-management/<int:pk>/delete/', views.cms_member_delete, name='cms_member_delete'),
     path('collaboration-management/', views.cms_collaboration_management, name='cms_collaboration_management'),
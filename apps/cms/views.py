@@ -8,7 +8,7 @@ from .forms import (
     HeroBannerForm, HomeContentForm, AnnouncementPopupForm, GalleryImageForm,
     OrganizationInfoForm, FounderForm, ChapterLocationForm, AchievementForm,
     ImpactStatForm, ContactInfoForm, DonationTierForm, BankDetailForm, IconConfigForm,
-    NavItemForm, SiteThemeForm, SiteIdentityForm, MemberForm, ProgramForm,
+    NavItemForm, SiteThemeForm, SiteIdentityForm, MemberForm, MemberImportForm, ProgramForm,
     QuickResponseForm, ChatSettingsForm, CollaborationForm,
     TeamPageSettingsForm, TeamChapterForm, LocationForm,
 )
@@ -21,6 +21,9 @@ from apps.about.models import OrganizationInfo, Founder, ChapterLocation, Achiev
 from apps.programs.models import Program, Category
 # Team
 from apps.team.models import Member, Chapter, Location, Collaboration, TeamPageSettings
+from apps.cms.exports import DATASETS, parse_columns, stream_csv, stream_vcards
+from apps.team.member_import import FIELDS as MEMBER_IMPORT_FIELDS, MemberImportError, import_members
+from apps.team.search import search_members
 # Impact
 from apps.impact.models import ImpactStat
 # Contact
@@ -31,6 +34,8 @@ from apps.donation.models import DonationTier, Donation, BankDetail
 from apps.membership.models import MembershipFee, VolunteerApplication, MembershipApplication
 # CMS
 from apps.cms.models import CMSNotification, IconConfig
+from apps.core.cache import bump_content_version
+from apps.core.jobs import latest_jobs
 
 
 def cms_login(request):
@@ -66,6 +71,16 @@ def cms_notifications_api(request):
     return JsonResponse({'notifications': data, 'unread_count': CMSNotification.objects.filter(is_read=False).count()})
 
 
+@cms_required
+@require_GET
+def cms_image_jobs_api(request):
+    """Status of the latest image job for each hero banner, polled by the CMS home page."""
+    from django.http import JsonResponse
+    jobs = latest_jobs(HeroBanner, HeroBanner.objects.values_list('pk', flat=True))
+    data = {pk: {'status': j.status, 'label': j.get_status_display(), 'progress': j.progress, 'error': j.error} for pk, j in jobs.items()}
+    return JsonResponse({'jobs': data})
+
+
 @cms_required
 def cms_notification_mark_read(request, pk):
     """Mark single notification as read."""
@@ -103,7 +118,10 @@ def cms_dashboard(request):
 @cms_required
 @require_GET
 def cms_home(request):
-    banners = HeroBanner.objects.all()
+    banners = list(HeroBanner.objects.all())
+    jobs = latest_jobs(HeroBanner, [b.pk for b in banners])
+    for b in banners:
+        b.image_job = jobs.get(b.pk)
     contents = HomeContent.objects.all()
     announcements = AnnouncementPopup.objects.all()
     gallery = GalleryImage.objects.all()
@@ -159,7 +177,7 @@ def cms_team(request):
 @cms_required
 def cms_team_page_settings(request):
     """CMS editor for Team page appearance and behavior."""
-    settings_obj = TeamPageSettings.get()
+    settings_obj = TeamPageSettings.load()
     defaults = TeamPageSettings.get_defaults()
 
     if request.method == 'POST':
@@ -284,6 +302,30 @@ def cms_member_action(request, model_type, pk, action):
     return redirect('cms_members')
 
 
+@cms_required
+@require_GET
+def cms_export(request, dataset, fmt):
+    """Stream a table as CSV (?columns=a,b to pick columns) or vCard, with the same filters as its CMS page."""
+    from django.http import Http404, HttpResponseBadRequest, StreamingHttpResponse
+    from django.utils import timezone
+    export = DATASETS.get(dataset)
+    if export is None or fmt not in ('csv', 'vcf'):
+        raise Http404
+    queryset = export.queryset(request.GET)
+    if fmt == 'csv':
+        try:
+            columns = parse_columns(export, request.GET.get('columns'))
+        except ValueError as e:
+            return HttpResponseBadRequest(str(e))
+        response = StreamingHttpResponse(stream_csv(export, queryset, columns), content_type='text/csv; charset=utf-8')
+    else:
+        response = StreamingHttpResponse(stream_vcards(export, queryset, request), content_type='text/vcard; charset=utf-8')
+    filename = f'{export.filename}-{timezone.localdate().isoformat()}.{fmt}'
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['Cache-Control'] = 'private, no-store'
+    return response
+
+
 # Edit views
 @cms_required
 def cms_banner_edit(request, pk=None):
@@ -486,32 +528,10 @@ def cms_icon_edit(request, pk):
     return render(request, 'cms/edit_form.html', {'form': form, 'title': f'Edit {obj.get_location_display()}', 'back_url': 'cms_icons'})
 
 
-def _ensure_default_nav_children():
-    """Ensure Programs has Gallery child (on hover) and Team has Collaborations child."""
-    programs = NavItem.objects.filter(url='/programs/', parent__isnull=True).first()
-    old = programs.children.filter(url='/programs/gallery/').first() if programs else None
-    if old:
-        old.url = '/gallery/'
-        old.save()
-    if programs and not programs.children.filter(url='/gallery/').exists():
-        NavItem.objects.get_or_create(
-            url='/gallery/', parent=programs,
-            defaults={'title': 'Gallery', 'icon_class': 'fas fa-images', 'order': 0, 'is_active': True}
-        )
-    # Ensure Team has Collaborations child
-    team = NavItem.objects.filter(url='/team/', parent__isnull=True).first()
-    if team and not team.children.filter(url='/team/collaborations/').exists():
-        NavItem.objects.get_or_create(
-            url='/team/collaborations/', parent=team,
-            defaults={'title': 'Collaboration / Partner Wings', 'icon_class': 'fas fa-handshake', 'order': 0, 'is_active': True}
-        )
-
-
 # Site Navigation Settings
 @cms_required
 @require_GET
 def cms_navigation(request):
-    _ensure_default_nav_children()
     items = NavItem.objects.filter(parent__isnull=True).prefetch_related('children')
     return render(request, 'cms/navigation.html', {'nav_items': items})
 
@@ -546,6 +566,8 @@ def cms_nav_reorder(request):
     order = request.POST.getlist('order[]')
     for i, pk in enumerate(order):
         NavItem.objects.filter(pk=pk).update(order=i)
+    # QuerySet.update() skips post_save, so drop the cached nav in every worker explicitly
+    bump_content_version()
     return JsonResponse({'ok': True})
 
 
@@ -593,6 +615,8 @@ def cms_nav_restore_defaults(request):
             c.save()
         if created:
             created_count += 1
+    # children.update() skips post_save
+    bump_content_version()
     messages.success(request, f'Restored default navigation ({created_count} new items).')
     return redirect('cms_navigation')
 
@@ -600,7 +624,7 @@ def cms_nav_restore_defaults(request):
 # Site theme / colors
 @cms_required
 def cms_theme(request):
-    theme = SiteTheme.get()
+    theme = SiteTheme.load()
     if request.method == 'POST':
         if request.POST.get('action') == 'reset':
             theme.primary_color = '#0B5345'
@@ -630,7 +654,7 @@ def cms_theme(request):
 # Site Identity
 @cms_required
 def cms_identity(request):
-    identity = SiteIdentity.get()
+    identity = SiteIdentity.load()
     if request.method == 'POST':
         if request.POST.get('action') == 'reset':
             identity.site_title = 'NHAF Nepal'
@@ -658,7 +682,7 @@ def cms_member_management(request):
     role_filter = request.GET.get('role', '')
     type_filter = request.GET.get('type', '')
     if role_filter:
-        members = members.filter(role__icontains=role_filter)
+        members = search_members(members, role_filter, columns=('role',), rank=False)
     if type_filter and type_filter in ('board', 'volunteer'):
         members = members.filter(member_type=type_filter)
     board_count = Member.objects.filter(member_type='board').count()
@@ -693,6 +717,33 @@ def cms_member_edit(request, pk=None):
     })
 
 
+@cms_required
+def cms_member_import(request):
+    """Bulk-add members from a CSV/XLSX upload (apps.team.member_import), with a per-row error report."""
+    result = None
+    if request.method == 'POST':
+        form = MemberImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            dry_run = form.cleaned_data['dry_run']
+            try:
+                result = import_members(form.cleaned_data['file'], dry_run=dry_run)
+            except MemberImportError as e:
+                form.add_error('file', str(e))
+            else:
+                verb = 'would be imported' if dry_run else 'imported'
+                if result.error_count:
+                    messages.warning(request, f'{result.created} members {verb}; {result.error_count} rows skipped.')
+                else:
+                    messages.success(request, f'{result.created} members {verb}.')
+    else:
+        form = MemberImportForm()
+    return render(request, 'cms/member_import.html', {
+        'form': form,
+        'result': result,
+        'columns': MEMBER_IMPORT_FIELDS,
+    })
+
+
 @cms_required
 @require_POST
 def cms_member_delete(request, pk):
@@ -710,6 +761,8 @@ def cms_member_reorder(request):
     order = request.POST.getlist('order[]')
     for i, pk in enumerate(order):
         Member.objects.filter(pk=pk).update(order=i)
+    # QuerySet.update() skips post_save, so drop the cached team fragments in every worker explicitly
+    bump_content_version()
     return JsonResponse({'ok': True})
 
 
@@ -887,14 +940,13 @@ def _chatsettings_columns(request):
 # Unified Chat (single CMS page: settings + quick responses + live conversations)
 @cms_required
 def cms_chat(request):
-    from django.utils import timezone
     from django.db import connection
-    settings = ChatSettings.get()
     try:
-        settings.admin_last_seen = timezone.now()
-        settings.save(update_fields=['admin_last_seen'])
+        ChatSettings.mark_admin_seen()
     except Exception:
         pass
+    # Loaded after the heartbeat, so saving the settings form keeps it
+    settings = ChatSettings.load()
     cols = _chatsettings_columns(request)
     def strip_missing_fields(form):
         if 'default_quick_response_id' not in cols and 'default_quick_response' in form.fields:
@@ -943,10 +995,7 @@ def cms_chat(request):
 @cms_required
 @require_GET
 def cms_live_chat(request):
-    from django.utils import timezone
-    s = ChatSettings.get()
-    s.admin_last_seen = timezone.now()
-    s.save(update_fields=['admin_last_seen'])
+    ChatSettings.mark_admin_seen()
     sessions = ChatMessage.objects.values('session_id', 'sender_name', 'sender_email').distinct()
     sessions_list = []
     for s in sessions:
@@ -966,10 +1015,7 @@ def cms_live_chat(request):
 
 @cms_required
 def cms_chat_session(request, session_id):
-    from django.utils import timezone
-    s = ChatSettings.get()
-    s.admin_last_seen = timezone.now()
-    s.save(update_fields=['admin_last_seen'])
+    ChatSettings.mark_admin_seen()
     messages_list = ChatMessage.objects.filter(session_id=session_id).order_by('created_at')
     ChatMessage.objects.filter(session_id=session_id, sender_type='user', is_read=False).update(is_read=True)
     if request.method == 'POST':
@@ -1053,7 +1099,7 @@ def cms_quick_response_reorder(request):
 
 @cms_required
 def cms_chat_settings(request):
-    settings = ChatSettings.get()
+    settings = ChatSettings.load()
     if request.method == 'POST':
         form = ChatSettingsForm(request.POST, instance=settings)
         if form.is_valid():
@@ -1,4 +1,12 @@
+from django.core.cache import cache
 from django.db import models
+from django.utils import timezone
+
+from apps.core.models import SingletonModel
+
+ADMIN_LAST_SEEN_KEY = 'contact:chat:admin_last_seen'
+# Seconds a worker trusts its cached heartbeat before reading the row again
+ADMIN_LAST_SEEN_TIMEOUT = 30
 
 
 class ContactInfo(models.Model):
@@ -76,7 +84,7 @@ class QuickResponse(models.Model):
         return False
 
 
-class ChatSettings(models.Model):
+class ChatSettings(SingletonModel):
     """Live chat system settings"""
     CHAT_MODE_BUILTIN = 'builtin'
     CHAT_MODE_WHATSAPP = 'whatsapp'
@@ -112,12 +120,29 @@ class ChatSettings(models.Model):
         verbose_name_plural = 'Chat settings'
 
     @classmethod
-    def get(cls):
-        obj, _ = cls.objects.get_or_create(pk=1)
-        return obj
+    def mark_admin_seen(cls):
+        """Record that an admin has the chat open.
+
+        QuerySet.update() sends no post_save, so the heartbeat leaves the cached
+        settings snapshot (which keeps a stale admin_last_seen) and every worker's
+        caches alone.
+        """
+        now = timezone.now()
+        cls.objects.filter(pk=1).update(admin_last_seen=now)
+        cache.set(ADMIN_LAST_SEEN_KEY, now, ADMIN_LAST_SEEN_TIMEOUT)
+
+    @classmethod
+    def last_admin_seen(cls):
+        """Latest heartbeat: one small query per ADMIN_LAST_SEEN_TIMEOUT seconds at most."""
+        missing = object()
+        seen = cache.get(ADMIN_LAST_SEEN_KEY, missing)
+        if seen is missing:
+            seen = cls.objects.filter(pk=1).values_list('admin_last_seen', flat=True).first()
+            cache.set(ADMIN_LAST_SEEN_KEY, seen, ADMIN_LAST_SEEN_TIMEOUT)
+        return seen
 
     def admin_is_online(self, minutes=5):
-        from django.utils import timezone
-        if not self.admin_last_seen:
+        seen = self.last_admin_seen()
+        if not seen:
             return False
-        return (timezone.now() - self.admin_last_seen).total_seconds() < minutes * 60
+        return (timezone.now() - seen).total_seconds() < minutes * 60
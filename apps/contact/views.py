@@ -64,21 +64,24 @@ def chat_send(request):
 @require_GET
 def chat_get(request):
     """Get chat messages for current session"""
+    # Online status lives here, not in the page: the homepage HTML is cached
+    online = ChatSettings.get().admin_is_online()
     session_id = request.session.get('chat_session_id')
     if not session_id:
-        return JsonResponse({'messages': []})
+        return JsonResponse({'messages': [], 'admin_online': online})
     messages_list = ChatMessage.objects.filter(session_id=session_id).order_by('created_at')
     data = [{'id': m.id, 'sender': m.sender_type, 'name': m.sender_name, 'message': m.message, 'time': m.created_at.isoformat()} for m in messages_list]
-    return JsonResponse({'messages': data})
+    return JsonResponse({'messages': data, 'admin_online': online})
 
 
 def members_page(request):
     """Members page - accessible via Terms > Members navigation"""
     from apps.team.models import Member
+    from apps.team.search import search_members
     members = Member.objects.filter(is_active=True).order_by('order', 'name')
     role_filter = request.GET.get('role', '')
     if role_filter:
-        members = members.filter(role__icontains=role_filter)
+        members = search_members(members, role_filter, columns=('role',), rank=False)
     return render(request, 'team/members_page.html', {'members': members, 'role_filter': role_filter})
 
 
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import HeroBanner, HomeContent, AnnouncementPopup, GalleryImage
+from .models import HeroBanner, HomeContent, AnnouncementPopup, GalleryImage, ImageJob
 
 
 @admin.register(HeroBanner)
@@ -34,3 +34,10 @@ class AnnouncementPopupAdmin(admin.ModelAdmin):
 class GalleryImageAdmin(admin.ModelAdmin):
     list_display = ['title', 'order', 'is_active']
     list_editable = ['order', 'is_active']
+
+
+@admin.register(ImageJob)
+class ImageJobAdmin(admin.ModelAdmin):
+    list_display = ['__str__', 'kind', 'status', 'progress', 'attempts', 'created_at', 'finished_at']
+    list_filter = ['status', 'kind']
+    readonly_fields = ['content_type', 'object_id', 'kind', 'progress', 'error', 'attempts', 'created_at', 'started_at', 'finished_at']
@@ -0,0 +1,99 @@
+"""Announcement popup scheduling and the cached "currently active" set read by the homepage."""
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q, Case, When, Value, IntegerField, Min
+from django.utils import timezone
+
+from .cache import register_local_cache
+
+ACTIVE_ANNOUNCEMENTS_KEY = 'core:announcements:active'
+# Statuses that can be shown: 'scheduled' popups go live at start_date even if the scheduler lags
+LIVE_STATUSES = ('published', 'scheduled')
+
+
+def next_announcement_boundary(now=None):
+    """Earliest future start_date/end_date of a live popup, i.e. when the active set next changes."""
+    from .models import AnnouncementPopup
+    now = now or timezone.now()
+    bounds = AnnouncementPopup.objects.filter(status__in=LIVE_STATUSES, is_active=True).aggregate(
+        next_start=Min('start_date', filter=Q(start_date__gt=now)),
+        next_end=Min('end_date', filter=Q(end_date__gte=now)),
+    )
+    candidates = [bounds['next_start']]
+    if bounds['next_end']:
+        # Popups stay visible while end_date >= now, so they drop out just after it
+        candidates.append(bounds['next_end'] + timedelta(seconds=1))
+    candidates = [c for c in candidates if c]
+    return min(candidates) if candidates else None
+
+
+def seconds_until(moment, now=None, default=None):
+    """Cache timeout (seconds, at least 1) that expires at moment; default if moment is None."""
+    if moment is None:
+        return default
+    now = now or timezone.now()
+    return max(int((moment - now).total_seconds()) + 1, 1)
+
+
+def _compute_active_announcements(now):
+    from .models import AnnouncementPopup
+    return list(AnnouncementPopup.objects.filter(
+        status__in=LIVE_STATUSES, is_active=True
+    ).filter(
+        Q(start_date__isnull=True) | Q(start_date__lte=now)
+    ).filter(
+        Q(end_date__isnull=True) | Q(end_date__gte=now)
+    ).annotate(
+        priority_order=Case(
+            When(priority='high', then=Value(0)),
+            When(priority='medium', then=Value(1)),
+            When(priority='low', then=Value(2)),
+            default=Value(1),
+            output_field=IntegerField()
+        )
+    ).order_by('priority_order', '-start_date', '-id'))
+
+
+def _active_state(now=None):
+    """(active popups, next boundary), cached together until that boundary or the next content edit."""
+    state = cache.get(ACTIVE_ANNOUNCEMENTS_KEY)
+    if state is None:
+        now = now or timezone.now()
+        boundary = next_announcement_boundary(now)
+        state = (_compute_active_announcements(now), boundary)
+        cache.set(ACTIVE_ANNOUNCEMENTS_KEY, state, seconds_until(boundary, now, default=60 * 60 * 24))
+    return state
+
+
+def active_announcements(now=None):
+    """Popups to show right now, highest priority first. Cached until the next start/end boundary."""
+    return _active_state(now)[0]
+
+
+def active_announcements_change_at(now=None):
+    """When the active set next changes (None if nothing is scheduled); no query while cached."""
+    return _active_state(now)[1]
+
+
+@register_local_cache
+def clear_active_announcements():
+    cache.delete(ACTIVE_ANNOUNCEMENTS_KEY)
+
+
+def apply_announcement_schedule(now=None):
+    """Move popups between scheduled, published and expired at their boundaries.
+
+    Drafts and inactive popups are left alone. Returns a dict of transition counts.
+    """
+    from .models import AnnouncementPopup
+    now = now or timezone.now()
+    live = AnnouncementPopup.objects.filter(is_active=True)
+    with transaction.atomic():
+        expired = live.filter(status__in=LIVE_STATUSES, end_date__lt=now).update(status='expired')
+        scheduled = live.filter(status='published', start_date__gt=now).update(status='scheduled')
+        published = live.filter(status='scheduled').filter(
+            Q(start_date__isnull=True) | Q(start_date__lte=now)
+        ).update(status='published')
+    return {'published': published, 'scheduled': scheduled, 'expired': expired}
@@ -7,4 +7,5 @@ class CoreConfig(AppConfig):
     verbose_name = 'Home & Core'
 
     def ready(self):
+        import apps.core.checks  # noqa: F401
         import apps.core.signals  # noqa: F401
@@ -0,0 +1,149 @@
+"""Cache helpers for global site chrome (nav, theme, identity, chat settings), team directory fragments and singleton rows.
+
+Per-process caches register a clear function with register_local_cache(); they are
+all dropped when the shared ContentVersion row changes (see ContentVersionMiddleware).
+"""
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+SITE_SETTINGS_VERSION_KEY = 'core:site_settings:version'
+SITE_SETTINGS_KEY = 'core:site_settings:{version}'
+HOME_PAGE_VERSION_KEY = 'core:home:version'
+HOME_PAGE_KEY = 'core:home:{version}:{site_version}'
+TEAM_DIRECTORY_VERSION_KEY = 'team:directory:version'
+TEAM_FRAGMENT_KEY = 'team:fragment:{version}:{digest}'
+
+# Clear functions for per-process caches, and the ContentVersion this process last saw
+_local_caches = []
+_seen_content_version = None
+
+
+def register_local_cache(clear):
+    """Register a no-argument function that empties a per-process cache. Usable as a decorator."""
+    _local_caches.append(clear)
+    return clear
+
+
+def clear_local_caches():
+    for clear in _local_caches:
+        clear()
+
+
+def _read_content_version():
+    from apps.core.models import ContentVersion
+    return ContentVersion.objects.filter(pk=1).values_list('version', flat=True).first() or 0
+
+
+def check_content_version():
+    """Drop local caches if another worker bumped ContentVersion since we last looked."""
+    global _seen_content_version
+    version = _read_content_version()
+    if _seen_content_version is not None and version != _seen_content_version:
+        clear_local_caches()
+    _seen_content_version = version
+
+
+def bump_content_version():
+    """Tell every worker (on any host sharing the database) to drop its local caches."""
+    global _seen_content_version
+    from django.db.models import F
+    from apps.core.models import ContentVersion
+    if not ContentVersion.objects.filter(pk=1).update(version=F('version') + 1):
+        ContentVersion.objects.get_or_create(pk=1, defaults={'version': 1})
+    clear_local_caches()
+    _seen_content_version = _read_content_version()
+
+
+def _timeout():
+    return getattr(settings, 'SITE_SETTINGS_CACHE_TIMEOUT', 60 * 60 * 24)
+
+
+def _get_version(key):
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+    return version
+
+
+def _bump_version(key):
+    cache.set(key, uuid.uuid4().hex, None)
+
+
+def get_site_settings_version():
+    """Return the current version token for the site settings bundle."""
+    return _get_version(SITE_SETTINGS_VERSION_KEY)
+
+
+@register_local_cache
+def bump_site_settings_version():
+    """Invalidate the cached bundle. Old entries simply expire."""
+    _bump_version(SITE_SETTINGS_VERSION_KEY)
+
+
+def get_site_settings_bundle(build):
+    """Return the cached bundle, calling build() to create it on a miss."""
+    key = SITE_SETTINGS_KEY.format(version=get_site_settings_version())
+    bundle = cache.get(key)
+    if bundle is None:
+        bundle = build()
+        cache.set(key, bundle, _timeout())
+    return bundle
+
+
+@register_local_cache
+def bump_home_page_version():
+    """Invalidate the cached homepage."""
+    _bump_version(HOME_PAGE_VERSION_KEY)
+
+
+def home_page_cache_key():
+    """Key for the rendered homepage; changes with homepage content or site chrome."""
+    return HOME_PAGE_KEY.format(
+        version=_get_version(HOME_PAGE_VERSION_KEY), site_version=get_site_settings_version()
+    )
+
+
+def get_team_directory_version():
+    """Version token for everything rendered from Member, Chapter and Location."""
+    return _get_version(TEAM_DIRECTORY_VERSION_KEY)
+
+
+@register_local_cache
+def bump_team_directory_version():
+    """Invalidate cached team filter fragments and the client search index."""
+    _bump_version(TEAM_DIRECTORY_VERSION_KEY)
+
+
+def team_fragment_cache_key(digest, version=None):
+    return TEAM_FRAGMENT_KEY.format(version=version or get_team_directory_version(), digest=digest)
+
+
+# Per-process read-only snapshots of SingletonModel rows, keyed by model class
+_singletons = {}
+
+
+def get_singleton(model):
+    """Return the frozen pk=1 snapshot for model, loading it once per process.
+
+    Never writes: if the row is missing (created by post_migrate) an unsaved
+    instance with field defaults is returned.
+    """
+    obj = _singletons.get(model)
+    if obj is None:
+        obj = model.objects.filter(pk=1).first() or model(pk=1)
+        obj.freeze()
+        _singletons[model] = obj
+    return obj
+
+
+@register_local_cache
+def clear_singletons(model=None):
+    """Drop the snapshot for model (or all snapshots) so the next get() reloads it."""
+    if model is None:
+        _singletons.clear()
+    else:
+        _singletons.pop(model, None)
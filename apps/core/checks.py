@@ -0,0 +1,28 @@
+"""System checks for core data the request path relies on but never writes."""
+from django.core.checks import Tags, Warning, register
+from django.db import DatabaseError
+
+
+@register(Tags.database)
+def check_default_nav(app_configs, databases=None, **kwargs):
+    """Warn when default nav children are missing.
+
+    Tagged database, so this runs during migrate and check --database only,
+    not when runserver or a WSGI worker starts.
+    """
+    if not databases:
+        return []
+    from apps.core.nav import nav_repairs_needed
+    try:
+        repairs = nav_repairs_needed()
+    except DatabaseError:
+        # Table not created yet (fresh database before migrate)
+        return []
+    return [
+        Warning(
+            f'Navigation needs repair: {line}',
+            hint='Run "python manage.py repair_nav".',
+            id='core.W001',
+        )
+        for line in repairs
+    ]
@@ -1,5 +1,11 @@
-def site_settings(request):
-    """Global context for templates"""
+from apps.core.cache import get_site_settings_bundle
+
+
+def _build_site_settings():
+    """Query everything the global templates need. Cached by site_settings().
+
+    Read-only: default nav children are repaired by migration / `manage.py repair_nav`.
+    """
     from apps.core.models import HomeContent
     contents = {c.key: c for c in HomeContent.objects.filter(is_active=True)}
     result = {'site_contents': contents}
@@ -12,18 +18,6 @@ def site_settings(request):
     try:
         from django.db.models import Prefetch
         from apps.core.models import NavItem
-        # Ensure Programs has Gallery child (for hover submenu)
-        programs = NavItem.objects.filter(url='/programs/', parent__isnull=True).first()
-        if programs:
-            old = programs.children.filter(url='/programs/gallery/').first()
-            if old:
-                old.url = '/gallery/'
-                old.save()
-            if not programs.children.filter(url='/gallery/', is_active=True).exists():
-                NavItem.objects.get_or_create(
-                    url='/gallery/', parent=programs,
-                    defaults={'title': 'Gallery', 'icon_class': 'fas fa-images', 'order': 0, 'is_active': True}
-                )
         result['nav_items'] = list(NavItem.objects.filter(is_active=True, parent__isnull=True).prefetch_related(
             Prefetch('children', queryset=NavItem.objects.filter(is_active=True).order_by('order', 'id'))
         ))
@@ -41,14 +35,22 @@ def site_settings(request):
         result['site_identity'] = None
     try:
         from apps.contact.models import ChatSettings
-        settings = ChatSettings.get()
-        result['chat_settings'] = settings
-        try:
-            result['admin_chat_online'] = settings.admin_is_online()
-        except Exception:
-            result['admin_chat_online'] = False
+        result['chat_settings'] = ChatSettings.get()
     except Exception:
         result['chat_settings'] = None
-        result['admin_chat_online'] = False
+    return result
+
 
+def site_settings(request):
+    """Global context for templates"""
+    result = dict(get_site_settings_bundle(_build_site_settings))
+    chat_settings = result['chat_settings']
+    # Online status depends on the current time, so it is never cached. Templates call this
+    # only where they show it; the chat widget reads it from chat_get instead.
+    def admin_chat_online():
+        try:
+            return bool(chat_settings) and chat_settings.admin_is_online()
+        except Exception:
+            return False
+    result['admin_chat_online'] = admin_chat_online
     return result
@@ -0,0 +1,222 @@
+"""Responsive image renditions - several widths in WebP and JPEG for each uploaded image.
+
+Models opt in by inheriting RenditionsMixin and listing their ImageFields in
+rendition_fields. Rendition file names are stored in the model's `renditions`
+JSON field, keyed by field name:
+
+    {'image': {'source': 'gallery/a.png', 'width': 4000, 'height': 3000, 'config': '3e0c...',
+               'color': '#6b8f3a', 'alpha': False, 'lqip': 'data:image/webp;base64,...',
+               'webp': {'320': 'renditions/gallery/a-320w.webp', ...},
+               'jpeg': {'320': 'renditions/gallery/a-320w.jpg', ...}}}
+"""
+import base64
+import hashlib
+import io
+import math
+import os
+
+from PIL import Image
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import models
+
+from .utils import decode_image, displayed_size, open_image
+
+RENDITION_DIR = 'renditions'
+# Bump when the stored rendition data changes shape, so existing rows count as outdated
+RENDITIONS_VERSION = 2
+LQIP_WIDTH = 16
+DEFAULT_WIDTHS = (320, 640, 960, 1280, 1920)
+FORMATS = {
+    # key: (PIL format, extension, save options)
+    'webp': ('WEBP', 'webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+def rendition_widths():
+    return tuple(sorted(getattr(settings, 'IMAGE_RENDITION_WIDTHS', DEFAULT_WIDTHS)))
+
+
+def renditions_config():
+    """Short hash of the widths and encoder settings; renditions built with others are outdated."""
+    return hashlib.sha1(repr((RENDITIONS_VERSION, rendition_widths(), sorted(FORMATS.items()))).encode()).hexdigest()[:12]
+
+
+class RenditionsMixin(models.Model):
+    """Abstract base for models whose images get responsive renditions."""
+    rendition_fields = ()
+
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def renditions_for(self, field_name):
+        """Stored renditions for field_name, or {} if missing, stale (file was replaced) or undecodable."""
+        data = (self.renditions or {}).get(field_name) or {}
+        file = getattr(self, field_name)
+        if not file or data.get('source') != file.name or data.get('error'):
+            return {}
+        return data
+
+
+def _rendition_name(source_name, width, ext):
+    stem = os.path.splitext(source_name)[0]
+    return f'{RENDITION_DIR}/{stem}-{width}w.{ext}'
+
+
+def _flatten(img):
+    """RGB copy for JPEG output; transparent areas become white."""
+    if img.mode in ('RGBA', 'LA', 'P'):
+        img = img.convert('RGBA')
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        background.paste(img, mask=img.split()[-1])
+        return background
+    return img.convert('RGB')
+
+
+def _has_alpha(img):
+    return img.mode == 'RGBA' and img.getchannel('A').getextrema()[0] < 255
+
+
+def _dominant_color(img):
+    """Most common of a few quantised colours, as '#rrggbb'."""
+    small = _flatten(img)
+    small.thumbnail((64, 64))
+    quantized = small.quantize(colors=5)
+    _count, index = max(quantized.getcolors())
+    r, g, b = quantized.getpalette()[index * 3:index * 3 + 3]
+    return f'#{r:02x}{g:02x}{b:02x}'
+
+
+def _lqip(img):
+    """Tiny WebP data URI (~150 bytes) shown blurred while the real image loads."""
+    tiny = _flatten(img)
+    tiny.thumbnail((LQIP_WIDTH, LQIP_WIDTH * 4))
+    buf = io.BytesIO()
+    tiny.save(buf, format='WEBP', quality=30)
+    return 'data:image/webp;base64,' + base64.b64encode(buf.getvalue()).decode('ascii')
+
+
+def delete_renditions(data, storage=None):
+    storage = storage or default_storage
+    for fmt in FORMATS:
+        for name in (data.get(fmt) or {}).values():
+            try:
+                storage.delete(name)
+            except Exception:
+                pass
+
+
+def generate_renditions(field_file, widths=None, storage=None):
+    """Encode field_file at each width (capped at its own width) in every format.
+
+    Returns the dict stored in RenditionsMixin.renditions for this field. If the
+    file cannot be decoded as an image, that dict only records the failure
+    ({'source', 'config', 'error'}), so the file is not retried until it or
+    the rendition settings change.
+    """
+    storage = storage or default_storage
+    widths = widths or rendition_widths()
+    try:
+        field_file.open('rb')
+        img = open_image(field_file)
+        # Nothing larger than the widest rendition is needed (JPEG draft decode)
+        src_w, src_h = displayed_size(img)
+        widest = min(max(widths), src_w)
+        img = decode_image(img, (widest, math.ceil(src_h * widest / src_w)))
+    except Exception as exc:
+        return {'source': field_file.name, 'config': renditions_config(), 'error': f'{type(exc).__name__}: {exc}'}
+    finally:
+        try:
+            field_file.close()
+        except Exception:
+            pass
+    targets = sorted({min(w, src_w) for w in widths}, reverse=True)
+    data = {'source': field_file.name, 'width': src_w, 'height': src_h, 'config': renditions_config()}
+    for fmt in FORMATS:
+        data[fmt] = {}
+    if img.mode not in ('RGB', 'RGBA'):
+        has_alpha = img.mode in ('LA', 'PA') or 'transparency' in img.info
+        img = img.convert('RGBA' if has_alpha else 'RGB')
+    current = img
+    # Largest first, each step downscales the previous result (cheaper than from the original)
+    for w in targets:
+        h = max(round(src_h * w / src_w), 1)
+        if current.size != (w, h):
+            current = current.resize((w, h), Image.LANCZOS)
+        for fmt, (pil_format, ext, options) in FORMATS.items():
+            out = current if pil_format != 'JPEG' else _flatten(current)
+            buf = io.BytesIO()
+            out.save(buf, format=pil_format, **options)
+            name = storage.save(_rendition_name(field_file.name, w, ext), ContentFile(buf.getvalue()))
+            data[fmt][str(w)] = name
+    # Placeholders from the smallest rendition, so templates can paint them without opening the file
+    data['alpha'] = _has_alpha(current)
+    data['color'] = _dominant_color(current)
+    data['lqip'] = _lqip(current)
+    return data
+
+
+def _field_stale(file, data, config):
+    if not file:
+        return bool(data)
+    return data.get('source') != file.name or data.get('config') != config
+
+
+def renditions_stale(instance):
+    """True if any rendition field's file or the rendition settings changed since they were built."""
+    current = instance.renditions or {}
+    config = renditions_config()
+    return any(
+        _field_stale(getattr(instance, field_name), current.get(field_name) or {}, config)
+        for field_name in instance.rendition_fields
+    )
+
+
+def update_renditions(instance, force=False):
+    """(Re)generate renditions for every stale field of instance and store them.
+
+    Saves with QuerySet.update() so post_save is not fired again. Returns True if
+    anything changed.
+    """
+    current = dict(instance.renditions or {})
+    config = renditions_config()
+    changed = False
+    for field_name in instance.rendition_fields:
+        file = getattr(instance, field_name)
+        old = current.get(field_name) or {}
+        if not file and not old:
+            continue
+        if not force and not _field_stale(file, old, config):
+            continue
+        delete_renditions(old)
+        current.pop(field_name, None)
+        if file:
+            current[field_name] = generate_renditions(file)
+        changed = True
+    if changed:
+        instance.renditions = current
+        type(instance).objects.filter(pk=instance.pk).update(renditions=current)
+    return changed
+
+
+def srcset(data, fmt):
+    """'url 320w, url 640w' for one format of a renditions dict."""
+    return ', '.join(
+        f'{default_storage.url(name)} {w}w'
+        for w, name in sorted((data.get(fmt) or {}).items(), key=lambda kv: int(kv[0]))
+    )
+
+
+def best_rendition_url(data, width, fmt='jpeg'):
+    """URL of the smallest rendition at least `width` wide (or the largest available)."""
+    options = sorted(((int(w), name) for w, name in (data.get(fmt) or {}).items()))
+    if not options:
+        return ''
+    for w, name in options:
+        if w >= width:
+            return default_storage.url(name)
+    return default_storage.url(options[-1][1])
@@ -0,0 +1,192 @@
+"""Database-backed queue for image processing (hero banner crops, responsive renditions).
+
+Saving a model only records an ImageJob; the decode/crop/encode work runs in a
+worker - `manage.py process_image_jobs --loop`, or a daemon thread in the web
+process when settings.IMAGE_JOBS_IN_PROCESS is on. Jobs are claimed with a
+conditional UPDATE, so any number of workers can share the queue.
+"""
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .cache import bump_content_version
+from .images import update_renditions
+from .utils import process_image_to_aspect_ratio
+
+logger = logging.getLogger(__name__)
+
+# Running jobs older than this are assumed to belong to a dead worker and are retried
+STALE_JOB_SECONDS = 10 * 60
+MAX_ATTEMPTS = 3
+
+
+def _in_process():
+    return getattr(settings, 'IMAGE_JOBS_IN_PROCESS', False)
+
+
+def enqueue_image_job(instance, kind):
+    """Queue kind for instance unless an identical job is already waiting. Returns the job."""
+    from .models import ImageJob
+    content_type = ContentType.objects.get_for_model(instance)
+    job = ImageJob.objects.filter(
+        content_type=content_type, object_id=instance.pk, kind=kind, status='pending'
+    ).first()
+    if job is None:
+        job = ImageJob.objects.create(content_type=content_type, object_id=instance.pk, kind=kind)
+    if _in_process():
+        transaction.on_commit(wake_worker)
+    return job
+
+
+def latest_jobs(model, ids):
+    """{object_id: newest ImageJob} for the given rows of model."""
+    from .models import ImageJob
+    jobs = {}
+    for job in ImageJob.objects.filter(
+        content_type=ContentType.objects.get_for_model(model), object_id__in=list(ids)
+    ).order_by('created_at', 'id'):
+        jobs[job.object_id] = job
+    return jobs
+
+
+def hero_banner_needs_processing(banner):
+    """True if the banner's image has not been cropped to its current aspect ratio yet.
+
+    The crop job stores the processed image's renditions, so matching rendition
+    source and proportions mean there is nothing to do.
+    """
+    if not banner.image:
+        return False
+    data = banner.renditions_for('image')
+    if not data or not data.get('height'):
+        return True
+    target_w, target_h = map(int, banner.aspect_ratio.split(':'))
+    return abs(data['width'] / data['height'] - target_w / target_h) >= 0.01
+
+
+def _set_progress(job, progress):
+    from .models import ImageJob
+    job.progress = progress
+    ImageJob.objects.filter(pk=job.pk).update(progress=progress)
+
+
+def _run_hero_crop(job, banner):
+    from .models import HeroBanner
+    old_name = banner.image.name
+    process_image_to_aspect_ratio(banner.image, banner.aspect_ratio)
+    _set_progress(job, 50)
+    if banner.image.name != old_name:
+        # Only swap in the crop if the banner still has the image we started from
+        if not HeroBanner.objects.filter(pk=banner.pk, image=old_name).update(image=banner.image.name):
+            banner.image.storage.delete(banner.image.name)
+            return False
+    update_renditions(banner)
+    return True
+
+
+def process_job(job):
+    """Do the work for one claimed job. Raises on failure."""
+    target = job.target
+    if target is None:
+        return False
+    _set_progress(job, 10)
+    if job.kind == 'hero_crop':
+        changed = _run_hero_crop(job, target)
+    else:
+        changed = update_renditions(target)
+    if changed:
+        # Rendered pages (homepage cache, per-process caches) reference the old files
+        bump_content_version()
+    return changed
+
+
+def requeue_stale_jobs(now=None):
+    """Hand jobs stuck in 'running' (worker killed mid-job) back to the queue."""
+    from .models import ImageJob
+    now = now or timezone.now()
+    stale = ImageJob.objects.filter(status='running', started_at__lt=now - timedelta(seconds=STALE_JOB_SECONDS))
+    failed = stale.filter(attempts__gte=MAX_ATTEMPTS).update(
+        status='failed', finished_at=now, error='Worker stopped before the job finished.'
+    )
+    return stale.update(status='pending') + failed
+
+
+def claim_next_job():
+    """Atomically move the oldest pending job to 'running' and return it, or None."""
+    from .models import ImageJob
+    while True:
+        job = ImageJob.objects.filter(status='pending').order_by('created_at', 'id').first()
+        if job is None:
+            return None
+        claimed = ImageJob.objects.filter(pk=job.pk, status='pending').update(
+            status='running', started_at=timezone.now(), attempts=F('attempts') + 1, progress=0, error=''
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+        # Another worker took it first
+
+
+def run_next_job():
+    """Claim and run one job. Returns the finished job, or None if the queue is empty."""
+    from .models import ImageJob
+    job = claim_next_job()
+    if job is None:
+        return None
+    try:
+        process_job(job)
+    except Exception as exc:
+        logger.exception('Image job %s failed', job.pk)
+        job.status, job.error = 'failed', f'{type(exc).__name__}: {exc}'
+    else:
+        job.status, job.progress = 'done', 100
+    job.finished_at = timezone.now()
+    ImageJob.objects.filter(pk=job.pk).update(
+        status=job.status, progress=job.progress, error=job.error, finished_at=job.finished_at
+    )
+    return job
+
+
+def run_pending_jobs(limit=None):
+    """Run jobs until the queue is empty (or limit jobs have run). Returns the jobs run."""
+    requeue_stale_jobs()
+    done = []
+    while limit is None or len(done) < limit:
+        job = run_next_job()
+        if job is None:
+            break
+        done.append(job)
+    return done
+
+
+# In-process worker: one daemon thread per process, woken after each enqueue commits
+_wakeup = threading.Event()
+_worker_lock = threading.Lock()
+_worker = None
+
+
+def _worker_loop():
+    while True:
+        _wakeup.wait()
+        _wakeup.clear()
+        try:
+            run_pending_jobs()
+        except Exception:
+            logger.exception('Image job worker error')
+        finally:
+            connection.close()
+
+
+def wake_worker():
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_worker_loop, name='image-jobs', daemon=True)
+            _worker.start()
+    _wakeup.set()
@@ -0,0 +1,95 @@
+import io
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+
+from PIL import Image
+from django.core.management.base import BaseCommand, CommandError
+from apps.core.utils import crop_to_aspect_ratio
+
+# name, size, format, EXIF orientation
+CASES = [
+    ('phone photo 6000x4000 JPEG', (6000, 4000), 'JPEG', None),
+    ('portrait 4000x6000 JPEG, EXIF rotated', (6000, 4000), 'JPEG', 6),
+    ('camera 8000x5000 JPEG', (8000, 5000), 'JPEG', None),
+    ('screenshot 3840x2160 PNG', (3840, 2160), 'PNG', None),
+]
+
+
+def _make_input(path, size, fmt, orientation):
+    # Noise keeps the encoders honest (flat colour compresses to nothing)
+    img = Image.merge('RGB', [Image.effect_noise(size, 40 + 10 * i) for i in range(3)])
+    options = {'quality': 90} if fmt == 'JPEG' else {}
+    if orientation:
+        exif = Image.Exif()
+        exif[0x0112] = orientation
+        options['exif'] = exif
+    img.save(path, format=fmt, **options)
+
+
+def _naive(path, ratio):
+    """The previous implementation: full decode and RGB conversion, crop, encode in memory."""
+    img = Image.open(path).convert('RGB')
+    w, h = img.size
+    target_w, target_h = map(int, ratio.split(':'))
+    new_h = int(w * target_h / target_w)
+    if new_h < h:
+        top = (h - new_h) // 2
+        img = img.crop((0, top, w, top + new_h))
+    else:
+        new_w = int(h * target_w / target_h)
+        left = (w - new_w) // 2
+        img = img.crop((left, 0, left + new_w, h))
+    output = io.BytesIO()
+    img.save(output, format='JPEG', quality=85, optimize=True)
+    return output.getvalue()
+
+
+def _bounded(path, ratio):
+    with open(path, 'rb') as f:
+        output = crop_to_aspect_ratio(f, ratio)
+        if output is not None:
+            with output:
+                return output.read()
+    return b''
+
+
+def _measure(mode, path, ratio, results):
+    """Child process: peak RSS growth (KiB on Linux) and time for one run."""
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    (_naive if mode == 'naive' else _bounded)(path, ratio)
+    elapsed = time.perf_counter() - start
+    results.put((resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before, elapsed))
+
+
+class Command(BaseCommand):
+    help = 'Measure peak memory of hero banner cropping for representative uploads (Linux)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ratio', default='16:9', help='Target aspect ratio (default 16:9)')
+
+    def handle(self, *args, **options):
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            raise CommandError('Needs the fork start method (Linux/macOS).')
+        ctx = multiprocessing.get_context('fork')
+        self.stdout.write(f'{"input":<40} {"file MB":>8} {"naive MB":>9} {"bounded MB":>11} {"naive s":>8} {"bounded s":>10}')
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, size, fmt, orientation in CASES:
+                path = os.path.join(tmp, f'input.{fmt.lower()}')
+                _make_input(path, size, fmt, orientation)
+                row = {}
+                for mode in ('naive', 'bounded'):
+                    # Fresh process per run so ru_maxrss reflects this run only
+                    results = ctx.Queue()
+                    proc = ctx.Process(target=_measure, args=(mode, path, options['ratio'], results))
+                    proc.start()
+                    row[mode] = results.get()
+                    proc.join()
+                self.stdout.write(
+                    f'{name:<40} {os.path.getsize(path) / 2**20:>8.1f} '
+                    f'{row["naive"][0] / 1024:>9.1f} {row["bounded"][0] / 1024:>11.1f} '
+                    f'{row["naive"][1]:>8.2f} {row["bounded"][1]:>10.2f}'
+                )
@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+from apps.core.jobs import run_pending_jobs
+
+
+class Command(BaseCommand):
+    help = 'Run queued image jobs (hero banner crops, responsive renditions)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep running (worker mode) instead of a single pass')
+        parser.add_argument('--interval', type=float, default=2, help='Seconds to wait when the queue is empty in --loop mode (default 2)')
+
+    def handle(self, *args, **options):
+        while True:
+            jobs = run_pending_jobs()
+            for job in jobs:
+                line = f'{job} {job.error}'.strip()
+                self.stdout.write(self.style.SUCCESS(line) if job.status == 'done' else self.style.ERROR(line))
+            if not options['loop']:
+                if not jobs:
+                    self.stdout.write('No pending image jobs.')
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,53 @@
+import os
+import time
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import models
+from apps.core.images import FORMATS, RenditionsMixin
+from apps.core.storage import is_content_addressed
+
+
+def referenced_media_names():
+    """Every file name stored in a FileField/ImageField or a renditions dict."""
+    names = set()
+    for model in apps.get_models():
+        file_fields = [f.name for f in model._meta.get_fields() if isinstance(f, models.FileField)]
+        if issubclass(model, RenditionsMixin):
+            for renditions in model._default_manager.values_list('renditions', flat=True):
+                for data in (renditions or {}).values():
+                    for fmt in FORMATS:
+                        names.update((data.get(fmt) or {}).values())
+        for field in file_fields:
+            names.update(n for n in model._default_manager.values_list(field, flat=True) if n)
+    return names
+
+
+class Command(BaseCommand):
+    help = 'Delete content-addressed media files that no row references any more'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only list the files that would be deleted')
+        parser.add_argument('--min-age', type=int, default=24 * 60 * 60,
+                            help='Keep files younger than this many seconds (uploads still being saved; default 1 day)')
+
+    def handle(self, *args, **options):
+        referenced = referenced_media_names()
+        cutoff = time.time() - options['min_age']
+        unused, size = [], 0
+        for root, _dirs, files in os.walk(default_storage.location):
+            for filename in files:
+                path = os.path.join(root, filename)
+                name = os.path.relpath(path, default_storage.location).replace(os.sep, '/')
+                # Only hashed names: other files may be linked from rich-text content
+                if not is_content_addressed(name) or name in referenced or os.path.getmtime(path) > cutoff:
+                    continue
+                unused.append(name)
+                size += os.path.getsize(path)
+        for name in unused:
+            self.stdout.write(name)
+            if not options['dry_run']:
+                os.remove(default_storage.path(name))
+        verb = 'Would delete' if options['dry_run'] else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {len(unused)} unused files ({size / 2**20:.1f} MB).'))
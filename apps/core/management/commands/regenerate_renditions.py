@@ -0,0 +1,128 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, models
+from apps.core.cache import bump_content_version
+from apps.core.images import RenditionsMixin, renditions_stale
+
+
+def _init_worker():
+    # Spawned/forkserver workers start without Django; forked ones must not reuse the parent's connections
+    import django
+    django.setup()
+    connections.close_all()
+
+
+def _regenerate(label, pk, force):
+    """Worker: rebuild renditions for one row.
+
+    Returns (images encoded, [(field, error)] for images that could not be decoded).
+    """
+    from apps.core.images import update_renditions
+    obj = apps.get_model(label)._default_manager.filter(pk=pk).first()
+    if obj is None:
+        return 0, []
+    update_renditions(obj, force=force)
+    encoded, errors = 0, []
+    for name in obj.rendition_fields:
+        if not getattr(obj, name):
+            continue
+        error = ((obj.renditions or {}).get(name) or {}).get('error')
+        if error:
+            errors.append((name, error))
+        else:
+            encoded += 1
+    return encoded, errors
+
+
+class Command(BaseCommand):
+    help = ('Regenerate WebP/JPEG renditions for every image field, in parallel. '
+            'Rows already built with the current settings are skipped, so an interrupted run resumes where it stopped. '
+            'Images that cannot be decoded are recorded and reported, and only retried once the file or settings '
+            'change, or with --force.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('apps', nargs='*', help='App labels to limit to (default: all apps)')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Worker processes (default: CPU count)')
+        parser.add_argument('--force', action='store_true', help='Rebuild every row, even if its renditions are current')
+        parser.add_argument('--chunk-size', type=int, default=500, help='Rows fetched per database round trip')
+
+    def _models(self, app_labels):
+        image_models, skipped = [], []
+        for model in apps.get_models():
+            if app_labels and model._meta.app_label not in app_labels:
+                continue
+            fields = [f.name for f in model._meta.get_fields() if isinstance(f, models.ImageField)]
+            if not fields:
+                continue
+            if issubclass(model, RenditionsMixin):
+                image_models.append(model)
+            else:
+                skipped.extend(f'{model._meta.label}.{name}' for name in fields)
+        return image_models, skipped
+
+    def _rows(self, model, force, chunk_size):
+        """Stream (label, pk) of rows needing work without loading whole tables."""
+        fields = ['pk', 'renditions', *model.rendition_fields]
+        for obj in model._default_manager.only(*fields).order_by('pk').iterator(chunk_size=chunk_size):
+            if force or renditions_stale(obj):
+                yield model._meta.label, obj.pk
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1:
+            raise CommandError('--workers must be at least 1.')
+        image_models, skipped = self._models(options['apps'])
+        for name in skipped:
+            self.stdout.write(f'Skipping {name}: model has no renditions (not a RenditionsMixin).')
+        if not image_models:
+            self.stdout.write('No models with renditions.')
+            return
+
+        # Workers open their own connections; don't let forked children inherit ours
+        connections.close_all()
+        start = last_report = time.monotonic()
+        rows = images = undecodable = failed = 0
+        max_pending = options['workers'] * 4
+        with ProcessPoolExecutor(max_workers=options['workers'], initializer=_init_worker) as pool:
+            pending = {}
+            for model in image_models:
+                for label, pk in self._rows(model, options['force'], options['chunk_size']):
+                    pending[pool.submit(_regenerate, label, pk, options['force'])] = (label, pk)
+                    if len(pending) < max_pending:
+                        continue
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        r, i, u, f = self._collect(future, pending.pop(future))
+                        rows, images, undecodable, failed = rows + r, images + i, undecodable + u, failed + f
+                    if time.monotonic() - last_report >= 5:
+                        last_report = time.monotonic()
+                        self._report(rows, images, undecodable, failed, last_report - start)
+            for future in list(pending):
+                r, i, u, f = self._collect(future, pending.pop(future))
+                rows, images, undecodable, failed = rows + r, images + i, undecodable + u, failed + f
+        elapsed = time.monotonic() - start
+        if rows:
+            bump_content_version()
+        self._report(rows, images, undecodable, failed, elapsed, final=True)
+
+    def _collect(self, future, row):
+        """(rows, images encoded, images undecodable, rows failed) for one finished row."""
+        try:
+            images, errors = future.result()
+        except Exception as exc:
+            self.stderr.write(f'{row[0]} #{row[1]}: {type(exc).__name__}: {exc}')
+            return 0, 0, 0, 1
+        for field_name, error in errors:
+            self.stderr.write(f'{row[0]} #{row[1]} {field_name}: cannot decode image ({error})')
+        return 1, images, len(errors), 0
+
+    def _report(self, rows, images, undecodable, failed, elapsed, final=False):
+        rate = images / elapsed if elapsed else 0
+        line = (f'{rows} rows, {images} images in {elapsed:.1f}s ({rate:.1f} images/s), '
+                f'{undecodable} undecodable, {failed} failed')
+        if final and undecodable:
+            line += ' (undecodable images are skipped until replaced; use --force to retry)'
+        self.stdout.write(self.style.SUCCESS(line) if final else line)
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from apps.core.cache import bump_site_settings_version
+from apps.core.nav import nav_repairs_needed, repair_default_nav
+
+
+class Command(BaseCommand):
+    help = 'Repair default navigation children (Programs -> Gallery, Team -> Collaborations)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only list the repairs that would be made')
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            repairs = nav_repairs_needed()
+        else:
+            repairs = repair_default_nav()
+            if repairs:
+                bump_site_settings_version()
+        for line in repairs:
+            self.stdout.write(line)
+        if not repairs:
+            self.stdout.write(self.style.SUCCESS('Navigation is up to date.'))
+        elif options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'\n{len(repairs)} repairs needed. Run without --dry-run to apply.'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'\nApplied {len(repairs)} navigation repairs.'))
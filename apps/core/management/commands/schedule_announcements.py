@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apps.core.announcements import apply_announcement_schedule, next_announcement_boundary
+
+
+class Command(BaseCommand):
+    help = 'Move announcement popups between scheduled, published and expired at their start/end dates'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep running (worker mode) instead of a single pass')
+        parser.add_argument('--interval', type=int, default=60, help='Max seconds between passes in --loop mode (default 60)')
+
+    def handle(self, *args, **options):
+        while True:
+            counts = apply_announcement_schedule()
+            if any(counts.values()) or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(
+                    'Published {published}, scheduled {scheduled}, expired {expired}.'.format(**counts)
+                ))
+            if not options['loop']:
+                return
+            # Wake at the next boundary if it comes before the regular interval
+            sleep_for = options['interval']
+            boundary = next_announcement_boundary()
+            if boundary:
+                sleep_for = min(sleep_for, max((boundary - timezone.now()).total_seconds(), 1))
+            time.sleep(sleep_for)
@@ -0,0 +1,33 @@
+"""Per-request hook that keeps per-process caches in sync across workers and hosts."""
+import time
+
+from django.conf import settings
+from django.db import DatabaseError
+
+from .cache import check_content_version
+
+
+class ContentVersionMiddleware:
+    """Compare the shared ContentVersion and drop stale local caches.
+
+    A worker looks at most once per CONTENT_VERSION_CHECK_INTERVAL seconds
+    (default 5), so steady-state requests, cached pages included, run no query
+    for it. The price is a staleness window: after an edit, other workers can
+    serve their old caches for up to that interval. The worker that made the
+    edit clears its own caches immediately. 0 checks on every request.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.interval = getattr(settings, 'CONTENT_VERSION_CHECK_INTERVAL', 5)
+        self.last_check = 0.0
+
+    def __call__(self, request):
+        now = time.monotonic()
+        if now - self.last_check >= self.interval:
+            self.last_check = now
+            try:
+                check_content_version()
+            except DatabaseError:
+                pass  # table not migrated yet
+        return self.get_response(request)
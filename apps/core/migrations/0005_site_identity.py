@@ -2,7 +2,7 @@ from django.db import migrations, models
 
 
 class Migration(migrations.Migration):
-    dependencies = [('core', '0004_default_nav_and_announcement_status')]
+    dependencies = [('core', '0004_default_nav_and_announcement_status'), ('programs', '0001_initial')]
 
     operations = [
         migrations.CreateModel(
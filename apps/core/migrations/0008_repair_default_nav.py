@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+def repair_nav(apps, schema_editor):
+    from apps.core.nav import repair_default_nav
+    repair_default_nav(apps.get_model('core', 'NavItem'))
+
+
+def reverse_noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+    dependencies = [('core', '0007_sitetheme_show_nav_arrows')]
+
+    operations = [
+        migrations.RunPython(repair_nav, reverse_noop),
+    ]
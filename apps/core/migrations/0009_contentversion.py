@@ -0,0 +1,33 @@
+from django.db import migrations, models
+
+
+def create_version_row(apps, schema_editor):
+    ContentVersion = apps.get_model('core', 'ContentVersion')
+    ContentVersion.objects.get_or_create(pk=1)
+
+
+def reverse_noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_repair_default_nav'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContentVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Content version',
+                'verbose_name_plural': 'Content version',
+            },
+        ),
+        migrations.RunPython(create_version_row, reverse_noop),
+    ]
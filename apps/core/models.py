@@ -1,8 +1,106 @@
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
 from django.db import models
+from django.db.models.fields.files import FieldFile
 
+from .images import RenditionsMixin
 
-class HeroBanner(models.Model):
+
+class SingletonModel(models.Model):
+    """Abstract base for pk=1 settings rows.
+
+    get() returns a shared, read-only snapshot cached per process (no queries in
+    steady state); load() returns a fresh editable row for CMS forms. The row is
+    created by post_migrate, never on the request path.
+    """
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def get(cls):
+        from apps.core.cache import get_singleton
+        return get_singleton(cls)
+
+    @classmethod
+    def load(cls):
+        obj, _ = cls.objects.get_or_create(pk=1)
+        return obj
+
+    def freeze(self):
+        self.__dict__['_frozen'] = True
+
+    def __setattr__(self, name, value):
+        if self.__dict__.get('_frozen'):
+            raise AttributeError(f'{type(self).__name__}.get() returns a read-only snapshot; use load() to edit.')
+        super().__setattr__(name, value)
+
+    def save(self, *args, **kwargs):
+        if self.__dict__.get('_frozen'):
+            raise AttributeError(f'{type(self).__name__}.get() returns a read-only snapshot; use load() to edit.')
+        self.pk = 1
+        super().save(*args, **kwargs)
+
+
+class FieldTrackerMixin(models.Model):
+    """Abstract base that remembers the stored values of tracked_fields, so change
+    checks cost no query.
+
+    Values are snapshotted when a row is loaded and again after save() and
+    refresh_from_db(); post_save receivers still see what the save changed.
+    """
+    tracked_fields = ()
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_tracked()
+        return instance
+
+    def _snapshot_tracked(self, fields=None):
+        loaded = self.__dict__.setdefault('_loaded_values', {})
+        for name in self.tracked_fields:
+            attname = self._meta.get_field(name).attname
+            # Deferred fields are not in __dict__; reading them here would cost the query we avoid
+            if (fields is None or name in fields or attname in fields) and attname in self.__dict__:
+                loaded[attname] = _tracked_value(self.__dict__[attname])
+
+    def has_changed(self, *fields):
+        """True if any of fields (default: all tracked_fields) differs from its stored value.
+
+        Always True for rows that were never loaded or saved. A deferred field that
+        was never read counts as unchanged.
+        """
+        loaded = self.__dict__.get('_loaded_values')
+        if loaded is None:
+            return True
+        for name in fields or self.tracked_fields:
+            attname = self._meta.get_field(name).attname
+            if attname in loaded and attname in self.__dict__ and _tracked_value(self.__dict__[attname]) != loaded[attname]:
+                return True
+        return False
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._snapshot_tracked(kwargs.get('update_fields'))
+
+    def refresh_from_db(self, *args, **kwargs):
+        # Arguments pass through unchanged: from_queryset only exists on Django 5.1+
+        super().refresh_from_db(*args, **kwargs)
+        self._snapshot_tracked(kwargs['fields'] if 'fields' in kwargs else (args[1] if len(args) > 1 else None))
+
+
+def _tracked_value(value):
+    # FieldFile is mutable (save() renames it); compare file names instead
+    return value.name if isinstance(value, FieldFile) else value
+
+
+class HeroBanner(RenditionsMixin):
     """Hero banner for homepage - CMS editable display options"""
+    rendition_fields = ('image',)
     ASPECT_RATIO_CHOICES = [
         ('16:9', '16:9 (Widescreen)'),
         ('21:9', '21:9 (Ultrawide)'),
@@ -73,7 +171,7 @@ class NavItem(models.Model):
         return self.title
 
 
-class SiteTheme(models.Model):
+class SiteTheme(SingletonModel):
     """Singleton theme settings - colors, nav styling"""
     primary_color = models.CharField(max_length=7, default='#0B5345')
     secondary_color = models.CharField(max_length=7, default='#148f77')
@@ -92,14 +190,10 @@ class SiteTheme(models.Model):
         verbose_name = 'Site theme'
         verbose_name_plural = 'Site theme'
 
-    @classmethod
-    def get(cls):
-        obj, _ = cls.objects.get_or_create(pk=1)
-        return obj
-
 
-class AnnouncementPopup(models.Model):
+class AnnouncementPopup(RenditionsMixin):
     """Popup announcements for homepage - can include image"""
+    rendition_fields = ('image',)
     PRIORITY_CHOICES = [('high', 'High'), ('medium', 'Medium'), ('low', 'Low')]
     STATUS_CHOICES = [
         ('draft', 'Draft'),
@@ -125,8 +219,9 @@ class AnnouncementPopup(models.Model):
         return self.title
 
 
-class GalleryImage(models.Model):
+class GalleryImage(RenditionsMixin):
     """Gallery images for homepage"""
+    rendition_fields = ('image',)
     title = models.CharField(max_length=200, blank=True)
     image = models.ImageField(upload_to='gallery/')
     caption = models.CharField(max_length=300, blank=True)
@@ -141,7 +236,7 @@ class GalleryImage(models.Model):
         return self.title or str(self.id)
 
 
-class SiteIdentity(models.Model):
+class SiteIdentity(SingletonModel):
     """Site identity - logo, favicon, title, tagline"""
     site_title = models.CharField(max_length=200, default='NHAF Nepal')
     tagline = models.CharField(max_length=300, blank=True)
@@ -152,10 +247,51 @@ class SiteIdentity(models.Model):
         verbose_name = 'Site identity'
         verbose_name_plural = 'Site identity'
 
-    @classmethod
-    def get(cls):
-        obj, _ = cls.objects.get_or_create(pk=1)
-        return obj
-
     def __str__(self):
         return self.site_title
+
+
+class ContentVersion(models.Model):
+    """Global counter bumped on CMS saves. Each worker compares it once per request
+    (ContentVersionMiddleware) and drops its per-process caches when it changes."""
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Content version'
+        verbose_name_plural = 'Content version'
+
+    def __str__(self):
+        return f'v{self.version}'
+
+
+class ImageJob(models.Model):
+    """Queued image processing for one model instance, run by a background worker (apps.core.jobs)."""
+    KIND_CHOICES = [
+        ('hero_crop', 'Crop hero banner + renditions'),
+        ('renditions', 'Image renditions'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveBigIntegerField()
+    target = GenericForeignKey('content_type', 'object_id')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending', db_index=True)
+    progress = models.PositiveSmallIntegerField(default=0, help_text='0-100')
+    error = models.TextField(blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at', 'id']
+        indexes = [models.Index(fields=['content_type', 'object_id'])]
+
+    def __str__(self):
+        return f'{self.get_kind_display()} #{self.object_id} ({self.status})'
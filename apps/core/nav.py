@@ -0,0 +1,53 @@
+"""Default navigation structure repairs - run from migrations/commands, never per request."""
+
+# (parent url, child url, defaults) - children every default nav is expected to have
+DEFAULT_NAV_CHILDREN = [
+    ('/programs/', '/gallery/', {'title': 'Gallery', 'icon_class': 'fas fa-images', 'order': 0, 'is_active': True}),
+    ('/team/', '/team/collaborations/', {'title': 'Collaboration / Partner Wings', 'icon_class': 'fas fa-handshake', 'order': 0, 'is_active': True}),
+]
+# Old child URLs that have moved: (parent url, old url, new url)
+MOVED_NAV_CHILDREN = [
+    ('/programs/', '/programs/gallery/', '/gallery/'),
+]
+
+
+def _get_model(NavItem):
+    if NavItem is None:
+        from apps.core.models import NavItem
+    return NavItem
+
+
+def nav_repairs_needed(NavItem=None):
+    """Return a list of human-readable repairs repair_default_nav() would make (read-only)."""
+    NavItem = _get_model(NavItem)
+    needed = []
+    for parent_url, old_url, new_url in MOVED_NAV_CHILDREN:
+        parent = NavItem.objects.filter(url=parent_url, parent__isnull=True).first()
+        if parent and NavItem.objects.filter(parent=parent, url=old_url).exists():
+            needed.append(f'Move {parent_url} child {old_url} -> {new_url}')
+    for parent_url, child_url, defaults in DEFAULT_NAV_CHILDREN:
+        parent = NavItem.objects.filter(url=parent_url, parent__isnull=True).first()
+        if parent and not NavItem.objects.filter(parent=parent, url=child_url).exists():
+            needed.append(f'Add {parent_url} child "{defaults["title"]}" ({child_url})')
+    return needed
+
+
+def repair_default_nav(NavItem=None):
+    """Apply moved URLs and add missing default children. Returns the list of repairs made.
+
+    Pass the historical NavItem model when calling from a migration.
+    """
+    NavItem = _get_model(NavItem)
+    done = []
+    for parent_url, old_url, new_url in MOVED_NAV_CHILDREN:
+        parent = NavItem.objects.filter(url=parent_url, parent__isnull=True).first()
+        if parent and NavItem.objects.filter(parent=parent, url=old_url).update(url=new_url):
+            done.append(f'Move {parent_url} child {old_url} -> {new_url}')
+    for parent_url, child_url, defaults in DEFAULT_NAV_CHILDREN:
+        parent = NavItem.objects.filter(url=parent_url, parent__isnull=True).first()
+        if not parent:
+            continue
+        _, created = NavItem.objects.get_or_create(url=child_url, parent=parent, defaults=defaults)
+        if created:
+            done.append(f'Add {parent_url} child "{defaults["title"]}" ({child_url})')
+    return done
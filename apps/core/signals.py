@@ -1,18 +1,134 @@
-"""Process hero banner images to aspect ratio on save."""
-from django.db.models.signals import post_save
+"""Queue hero banner crops and image renditions on save; invalidate cached site settings, homepage, team fragments, singletons and locations.
+
+Saves and deletes of cached content also bump ContentVersion, so other workers
+drop their local caches. QuerySet.update() callers bump it themselves.
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, post_migrate
 from django.dispatch import receiver
-from .models import HeroBanner
-from .utils import process_image_to_aspect_ratio
+from apps.cms.models import IconConfig
+from apps.contact.models import ChatSettings
+from apps.programs.models import Program
+from apps.team import typeahead
+from apps.team.locations import clear_location_registry
+from apps.team.models import Chapter, Collaboration, Location, Member
+from .announcements import clear_active_announcements
+from .cache import (
+    bump_content_version, bump_home_page_version, bump_site_settings_version, bump_team_directory_version,
+    clear_singletons,
+)
+from .images import RenditionsMixin, delete_renditions, renditions_stale
+from .jobs import enqueue_image_job, hero_banner_needs_processing
+from .models import (
+    HeroBanner, HomeContent, NavItem, SiteTheme, SiteIdentity, SingletonModel, AnnouncementPopup, GalleryImage,
+)
+
+SITE_SETTINGS_MODELS = (HomeContent, NavItem, SiteTheme, SiteIdentity, IconConfig, ChatSettings)
+HOME_PAGE_MODELS = (HeroBanner, HomeContent, AnnouncementPopup, GalleryImage, Program, Collaboration)
+TEAM_DIRECTORY_MODELS = (Member, Chapter, Location)
 
 
 @receiver(post_save, sender=HeroBanner)
-def process_hero_banner_image(sender, instance, created, **kwargs):
-    """Crop hero banner image to configured aspect ratio (default 16:9)."""
-    if getattr(instance, '_image_processed', False) or not instance.image:
+def queue_hero_banner_image(sender, instance, raw=False, **kwargs):
+    """Queue the crop to the configured aspect ratio (default 16:9); see apps.core.jobs."""
+    if not raw and hero_banner_needs_processing(instance):
+        enqueue_image_job(instance, 'hero_crop')
+
+
+@receiver(post_save, dispatch_uid='renditions_save')
+def queue_image_renditions(sender, instance, raw=False, **kwargs):
+    """Queue WebP/JPEG width renditions for RenditionsMixin models whose images changed."""
+    if raw or not issubclass(sender, RenditionsMixin) or sender is HeroBanner:
+        # Hero banners get their renditions from the crop job
         return
-    try:
-        process_image_to_aspect_ratio(instance.image, instance.aspect_ratio)
-        instance._image_processed = True
-        instance.save(update_fields=['image'])
-    except Exception:
-        pass
+    if renditions_stale(instance):
+        enqueue_image_job(instance, 'renditions')
+
+
+@receiver(post_delete, dispatch_uid='renditions_delete')
+def delete_image_renditions(sender, instance, **kwargs):
+    if issubclass(sender, RenditionsMixin):
+        for data in (instance.renditions or {}).values():
+            delete_renditions(data)
+
+
+def invalidate_site_settings(sender, **kwargs):
+    """Drop the cached site_settings bundle when any model it contains changes."""
+    bump_site_settings_version()
+
+
+for _model in SITE_SETTINGS_MODELS:
+    post_save.connect(invalidate_site_settings, sender=_model, dispatch_uid=f'site_settings_save_{_model.__name__}')
+    post_delete.connect(invalidate_site_settings, sender=_model, dispatch_uid=f'site_settings_delete_{_model.__name__}')
+
+
+def invalidate_home_page(sender, **kwargs):
+    """Drop the cached homepage when any content shown on it changes."""
+    bump_home_page_version()
+
+
+for _model in HOME_PAGE_MODELS:
+    post_save.connect(invalidate_home_page, sender=_model, dispatch_uid=f'home_page_save_{_model.__name__}')
+    post_delete.connect(invalidate_home_page, sender=_model, dispatch_uid=f'home_page_delete_{_model.__name__}')
+
+
+def invalidate_team_directory(sender, **kwargs):
+    """Drop cached team filter fragments when a member, chapter or location changes."""
+    bump_team_directory_version()
+
+
+for _model in TEAM_DIRECTORY_MODELS:
+    post_save.connect(invalidate_team_directory, sender=_model, dispatch_uid=f'team_directory_save_{_model.__name__}')
+    post_delete.connect(invalidate_team_directory, sender=_model, dispatch_uid=f'team_directory_delete_{_model.__name__}')
+
+
+@receiver(post_save, sender=Member)
+def update_member_typeahead(sender, instance, **kwargs):
+    # After commit, so a rolled-back save never shows up in suggestions
+    transaction.on_commit(lambda: typeahead.update_member(instance))
+
+
+@receiver(post_delete, sender=Member)
+def remove_member_typeahead(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: typeahead.remove_member(pk))
+
+
+@receiver(post_save, sender=AnnouncementPopup)
+@receiver(post_delete, sender=AnnouncementPopup)
+def invalidate_active_announcements(sender, **kwargs):
+    clear_active_announcements()
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_location_registry(sender, **kwargs):
+    clear_location_registry()
+
+
+@receiver(post_save, dispatch_uid='singleton_save')
+@receiver(post_delete, dispatch_uid='singleton_delete')
+def invalidate_singleton(sender, **kwargs):
+    """Drop the per-process snapshot returned by SingletonModel.get()."""
+    if issubclass(sender, SingletonModel):
+        clear_singletons(sender)
+
+
+# Everything any per-process cache is built from
+CONTENT_MODELS = {*SITE_SETTINGS_MODELS, *HOME_PAGE_MODELS, *TEAM_DIRECTORY_MODELS, AnnouncementPopup}
+
+
+@receiver(post_save, dispatch_uid='content_version_save')
+@receiver(post_delete, dispatch_uid='content_version_delete')
+def announce_content_change(sender, raw=False, **kwargs):
+    """Tell other workers to drop their local caches once the edit is committed."""
+    if not raw and (sender in CONTENT_MODELS or issubclass(sender, SingletonModel)):
+        transaction.on_commit(bump_content_version)
+
+
+@receiver(post_migrate, dispatch_uid='create_singletons')
+def create_singletons(sender, using='default', **kwargs):
+    """Create pk=1 rows for the migrated app's singletons so requests never have to."""
+    for model in sender.get_models():
+        if issubclass(model, SingletonModel):
+            model.objects.using(using).get_or_create(pk=1)
@@ -0,0 +1,64 @@
+"""Content-addressed media storage.
+
+Uploads are named by a hash of their bytes inside their upload_to directory
+('team/photo.jpg' -> 'team/3f1c...9a.jpg'), so saving identical bytes twice
+stores one file and the second save returns the existing name. A name never
+points at different content, which lets media be served with a year-long
+immutable Cache-Control (see apps.core.views.media).
+
+Because several rows can share one file, delete() keeps content-addressed
+files; `manage.py prune_media` removes those no longer referenced.
+"""
+import hashlib
+import os
+import posixpath
+import re
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+HASH_LENGTH = 32
+CONTENT_ADDRESSED_RE = re.compile(r'(?:^|/)[0-9a-f]{%d}(?:\.[a-z0-9]+)?$' % HASH_LENGTH)
+
+
+def is_content_addressed(name):
+    return bool(CONTENT_ADDRESSED_RE.search(name or ''))
+
+
+def content_hash(content):
+    digest = hashlib.sha256()
+    for chunk in content.chunks():
+        digest.update(chunk)
+    content.seek(0)
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage that names files by content hash and stores identical bytes once."""
+
+    def _excluded(self, name):
+        # ckeditor derives thumbnail URLs from the uploaded file name, so its uploads keep their names
+        upload_path = getattr(settings, 'CKEDITOR_UPLOAD_PATH', '')
+        return bool(upload_path) and name.startswith(upload_path)
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        name = str(name).replace('\\', '/')
+        if self._excluded(name):
+            return super().save(name, content, max_length)
+        directory, filename = posixpath.split(name)
+        ext = os.path.splitext(filename)[1].lower()
+        name = posixpath.join(directory, content_hash(content) + ext)
+        if self.exists(name):
+            return name
+        # If a concurrent save of the same bytes wins the race, Django falls back to a suffixed name
+        return super().save(name, content, max_length)
+
+    def delete(self, name):
+        if is_content_addressed(name):
+            return
+        super().delete(name)
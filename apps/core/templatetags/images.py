@@ -0,0 +1,99 @@
+"""Responsive <picture>/srcset tags for models using apps.core.images.RenditionsMixin, and on-demand thumbnails."""
+from django import template
+from django.forms.utils import flatatt
+from django.urls import reverse
+from django.utils.html import format_html
+
+from apps.core.images import best_rendition_url, srcset
+
+register = template.Library()
+
+
+def _renditions(instance, field_name):
+    if hasattr(instance, 'renditions_for'):
+        return instance.renditions_for(field_name)
+    return {}
+
+
+def _reserve_space(data, attrs):
+    """Intrinsic width/height (no layout shift) and a colour/blurred placeholder behind the image."""
+    if data.get('width') and data.get('height'):
+        attrs.setdefault('width', data['width'])
+        attrs.setdefault('height', data['height'])
+    if data.get('alpha') or not data.get('color'):
+        # A placeholder would show through transparent areas
+        return
+    background = f'background:{data["color"]}'
+    if data.get('lqip'):
+        background += f' url("{data["lqip"]}") center/cover no-repeat'
+    style = attrs.get('style', '').strip()
+    attrs['style'] = f'{style}{"" if not style or style.endswith(";") else ";"}{background};'
+
+
+@register.simple_tag
+def responsive_image(instance, field_name, sizes='100vw', **attrs):
+    """Render an image field as <picture> with WebP/JPEG srcsets.
+
+    Usage: {% responsive_image member 'photo' sizes='(max-width: 768px) 50vw, 300px' alt=member.name class='x' %}
+    Adds intrinsic width/height and a placeholder from the stored renditions data.
+    Falls back to a plain <img> of the original while renditions are missing.
+    """
+    file = getattr(instance, field_name, None)
+    if not file:
+        return ''
+    attrs.setdefault('loading', 'lazy')
+    attrs.setdefault('decoding', 'async')
+    attrs.setdefault('alt', '')
+    data = _renditions(instance, field_name)
+    if not data:
+        return format_html('<img src="{}"{}>', file.url, flatatt(attrs))
+    _reserve_space(data, attrs)
+    return format_html(
+        '<picture style="display:contents">'
+        '<source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}"{}>'
+        '</picture>',
+        srcset(data, 'webp'), sizes,
+        best_rendition_url(data, 960), srcset(data, 'jpeg'), sizes, flatatt(attrs),
+    )
+
+
+@register.simple_tag
+def rendition_url(instance, field_name, width=1920, fmt='jpeg'):
+    """URL of the rendition closest to `width` (for CSS backgrounds); original URL if none."""
+    file = getattr(instance, field_name, None)
+    if not file:
+        return ''
+    data = _renditions(instance, field_name)
+    return best_rendition_url(data, int(width), fmt) or file.url
+
+
+@register.simple_tag
+def thumbnail_url(file, width, height=0):
+    """URL of file as a width x height thumbnail (cover crop; 0 = proportional)."""
+    if not file:
+        return ''
+    return reverse('thumbnail', kwargs={'width': int(width), 'height': int(height), 'path': file.name})
+
+
+@register.simple_tag
+def thumbnail(file, width, height=0, **attrs):
+    """<img> of a small thumbnail with a 2x srcset for high-density screens.
+
+    Usage: {% thumbnail member.photo 44 44 alt=member.name class='rounded-circle' %}
+    The size must be listed in settings.THUMBNAIL_SIZES.
+    """
+    if not file:
+        return ''
+    width, height = int(width), int(height)
+    attrs.setdefault('loading', 'lazy')
+    attrs.setdefault('decoding', 'async')
+    attrs.setdefault('alt', '')
+    if width:
+        attrs.setdefault('width', width)
+    if height:
+        attrs.setdefault('height', height)
+    return format_html(
+        '<img src="{}" srcset="{} 2x"{}>',
+        thumbnail_url(file, width, height), thumbnail_url(file, width * 2, height * 2), flatatt(attrs),
+    )
@@ -0,0 +1,88 @@
+import os
+import tempfile
+
+from PIL import Image
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from apps.contact.models import ChatSettings
+from apps.core.cache import clear_local_caches
+from apps.core.models import ContentVersion, NavItem
+from apps.core.nav import nav_repairs_needed
+
+PUBLIC_URLS = ['/', '/about/', '/team/', '/gallery/', '/programs/', '/contact/', '/impact/', '/donate/']
+WRITES = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+
+class PublicPagesReadOnlyTests(TestCase):
+    """Public pages must never write: nav repairs run from migrations and repair_nav only."""
+
+    def setUp(self):
+        # Start every test cold, so rebuilding the per-process caches is covered too
+        clear_local_caches()
+
+    def assertNoWrites(self, urls):
+        for url in urls:
+            with self.subTest(url=url), CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                writes = [q['sql'] for q in queries.captured_queries if q['sql'].lstrip().upper().startswith(WRITES)]
+                self.assertEqual(writes, [])
+
+    def test_public_pages_do_not_write(self):
+        self.assertNoWrites(PUBLIC_URLS)
+
+    def test_missing_default_nav_child_is_not_repaired_by_requests(self):
+        NavItem.objects.all().delete()
+        programs = NavItem.objects.create(title='Programs', url='/programs/')
+        NavItem.objects.create(title='Team', url='/team/')
+        self.assertTrue(nav_repairs_needed())
+        self.assertNoWrites(PUBLIC_URLS)
+        self.assertFalse(NavItem.objects.filter(parent=programs).exists())
+
+
+class ContentVersionTests(TestCase):
+    """Only content edits may make every worker drop its caches; the chat heartbeat must not."""
+
+    def version(self):
+        return ContentVersion.objects.filter(pk=1).values_list('version', flat=True).first() or 0
+
+    def test_chat_heartbeat_does_not_bump(self):
+        before = self.version()
+        with self.captureOnCommitCallbacks(execute=True):
+            ChatSettings.mark_admin_seen()
+        self.assertEqual(self.version(), before)
+        self.assertTrue(ChatSettings.get().admin_is_online())
+
+    def test_content_edit_bumps_after_commit(self):
+        before = self.version()
+        with self.captureOnCommitCallbacks(execute=True):
+            NavItem.objects.create(title='Blog', url='/blog/')
+        self.assertEqual(self.version(), before + 1)
+
+
+class ThumbnailSizeTests(TestCase):
+    """/media/thumb/ encodes only the whitelisted sizes, so clients cannot churn the cache."""
+
+    def setUp(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        os.makedirs(os.path.join(root.name, 'media', 'team'))
+        Image.new('RGB', (200, 200), 'teal').save(os.path.join(root.name, 'media', 'team', 'a.jpg'))
+        media = override_settings(
+            MEDIA_ROOT=os.path.join(root.name, 'media'), THUMBNAIL_CACHE_DIR=os.path.join(root.name, 'thumbs'),
+            THUMBNAIL_SIZES=[(44, 44)],
+        )
+        media.enable()
+        self.addCleanup(media.disable)
+
+    def test_listed_sizes_and_their_2x_are_served(self):
+        for size in ('44x44', '88x88'):
+            with self.subTest(size=size):
+                self.assertEqual(self.client.get(f'/media/thumb/{size}/team/a.jpg').status_code, 200)
+
+    def test_other_sizes_are_not_found(self):
+        for size in ('45x45', '0x44', '512x512', '0x0'):
+            with self.subTest(size=size):
+                self.assertEqual(self.client.get(f'/media/thumb/{size}/team/a.jpg').status_code, 404)
@@ -0,0 +1,176 @@
+"""On-demand thumbnails for /media/thumb/<w>x<h>/<path> (CMS avatars, partner logos).
+
+Each thumbnail is encoded once and kept in a size-capped disk cache
+(settings.THUMBNAIL_CACHE_DIR). Hits refresh the file's mtime and eviction
+removes the least recently used files first. A per-thumbnail lock file makes
+concurrent requests - threads or worker processes - wait for a single encode.
+"""
+import hashlib
+import os
+import time
+
+from PIL import Image, ImageOps
+from django.conf import settings
+from django.core.files import locks
+from django.core.files.storage import default_storage
+
+from .utils import decode_image, displayed_size, open_image
+
+# (width, height) pairs templates ask for; each also allows its 2x srcset size
+DEFAULT_SIZES = ((36, 36), (44, 44), (0, 88))
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+# Only refresh mtime (the LRU clock) on hits older than this, to avoid a write per request
+TOUCH_INTERVAL = 60 * 60
+FORMATS = {
+    # key: (PIL format, extension, content type, save options)
+    'webp': ('WEBP', 'webp', 'image/webp', {'quality': 80, 'method': 4}),
+    'png': ('PNG', 'png', 'image/png', {'optimize': True}),
+    'jpeg': ('JPEG', 'jpg', 'image/jpeg', {'quality': 85, 'optimize': True, 'progressive': True}),
+}
+_ALPHA_EXTENSIONS = ('.png', '.gif', '.webp')
+
+# Bytes this process has added since it last measured the cache
+_added_since_scan = None
+
+
+def allowed_sizes():
+    """Sizes /media/thumb/ serves: THUMBNAIL_SIZES and their 2x doubles."""
+    sizes = {tuple(size) for size in getattr(settings, 'THUMBNAIL_SIZES', DEFAULT_SIZES)}
+    return sizes | {(width * 2, height * 2) for width, height in sizes}
+
+
+def cache_dir():
+    return str(getattr(settings, 'THUMBNAIL_CACHE_DIR', os.path.join(settings.BASE_DIR, 'cache', 'thumbs')))
+
+
+def cache_max_bytes():
+    return getattr(settings, 'THUMBNAIL_CACHE_MAX_BYTES', DEFAULT_CACHE_BYTES)
+
+
+def choose_format(name, accept=''):
+    """WebP when the client accepts it, else PNG for formats that may be transparent, else JPEG."""
+    if 'image/webp' in accept:
+        return 'webp'
+    return 'png' if os.path.splitext(name)[1].lower() in _ALPHA_EXTENSIONS else 'jpeg'
+
+
+def content_type(fmt):
+    return FORMATS[fmt][2]
+
+
+def _encode(source, target, width, height, fmt):
+    """Cover-crop to width x height, or scale proportionally when one side is 0."""
+    pil_format, _ext, _type, options = FORMATS[fmt]
+    with open(source, 'rb') as f:
+        img = open_image(f)
+        src_w, src_h = displayed_size(img)
+        if width and height:
+            scale = max(width / src_w, height / src_h)
+        else:
+            scale = width / src_w if width else height / src_h
+        scale = min(scale, 1)
+        img = decode_image(img, (max(round(src_w * scale), 1), max(round(src_h * scale), 1)))
+        if img.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+            # Palette images would otherwise be resized with nearest-neighbour
+            img = img.convert('RGBA')
+        if width and height:
+            img = ImageOps.fit(img, (min(width, img.width), min(height, img.height)), Image.LANCZOS)
+        elif scale < 1:
+            img.thumbnail((max(round(src_w * scale), 1), max(round(src_h * scale), 1)), Image.LANCZOS)
+    if pil_format == 'JPEG' and img.mode != 'RGB':
+        img = img.convert('RGB')
+    img.save(target, format=pil_format, **options)
+
+
+def get_thumbnail(name, width, height, fmt):
+    """Filesystem path of the cached thumbnail of media file name, encoding it if needed.
+
+    Raises FileNotFoundError / SuspiciousFileOperation for bad names and PIL errors for non-images.
+    """
+    source = default_storage.path(name)
+    stat = os.stat(source)
+    # Source mtime/size in the key: a file replaced under the same name gets a new thumbnail
+    key = hashlib.sha1(f'{name}:{stat.st_mtime_ns}:{stat.st_size}'.encode()).hexdigest()
+    path = os.path.join(cache_dir(), f'{width}x{height}', key[:2], f'{key}.{FORMATS[fmt][1]}')
+    if os.path.exists(path):
+        _touch(path)
+        return path
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    lock_path = path + '.lock'
+    created = False
+    with open(lock_path, 'wb') as lock:
+        locks.lock(lock, locks.LOCK_EX)
+        try:
+            # Another request may have encoded it while we waited for the lock
+            if not os.path.exists(path):
+                tmp = f'{path}.{os.getpid()}.tmp'
+                try:
+                    _encode(source, tmp, width, height, fmt)
+                    os.replace(tmp, path)
+                    created = True
+                finally:
+                    if os.path.exists(tmp):
+                        os.remove(tmp)
+            try:
+                # Safe while locked: waiters re-check path, which already exists
+                os.remove(lock_path)
+            except OSError:
+                pass
+        finally:
+            locks.unlock(lock)
+    if created:
+        _record_added(os.path.getsize(path))
+    return path
+
+
+def _touch(path):
+    """Mark a cache hit as recently used."""
+    try:
+        if os.path.getmtime(path) < time.time() - TOUCH_INTERVAL:
+            os.utime(path)
+    except OSError:
+        pass
+
+
+def _record_added(size):
+    """Evict once this process has added ~10% of the cap since it last measured the cache."""
+    global _added_since_scan
+    if _added_since_scan is None or _added_since_scan + size > cache_max_bytes() // 10:
+        evict()
+        _added_since_scan = 0
+    else:
+        _added_since_scan += size
+
+
+def evict(max_bytes=None):
+    """Delete least recently used thumbnails until the cache is under 90% of max_bytes.
+
+    Returns the number of files removed.
+    """
+    max_bytes = cache_max_bytes() if max_bytes is None else max_bytes
+    entries, total = [], 0
+    for root, _dirs, files in os.walk(cache_dir()):
+        for filename in files:
+            if filename.endswith(('.lock', '.tmp')):
+                continue
+            path = os.path.join(root, filename)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+    if total <= max_bytes:
+        return 0
+    removed = 0
+    entries.sort()
+    for _mtime, size, path in entries:
+        if total <= max_bytes * 0.9:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
@@ -1,44 +1,142 @@
-"""Image processing utilities - resize/crop to aspect ratio."""
-import io
-from PIL import Image
-from django.core.files.base import ContentFile
+"""Image processing utilities - resize/crop to aspect ratio.
 
+Large uploads are handled with bounded memory: the pixel count is checked from
+the file header before any decoding, JPEGs are decoded at a reduced scale (draft
+mode) when the output needs fewer pixels, the crop happens before the colour
+conversion, and the encoded result is spooled to a temporary file rather than
+held in memory.
+"""
+import math
+import os
+import tempfile
 
-def process_image_to_aspect_ratio(image_field, target_ratio='16:9', quality=85):
+from PIL import Image, ImageOps, UnidentifiedImageError
+from django.conf import settings
+from django.core.files import File
+
+DEFAULT_MAX_PIXELS = 50_000_000
+DEFAULT_MAX_WIDTH = 2560
+# Encoded output above this size is written to disk instead of memory
+SPOOL_MAX_SIZE = 1024 * 1024
+_EXIF_ORIENTATION = 0x0112
+# EXIF orientations that swap width and height
+_TRANSPOSED = (5, 6, 7, 8)
+
+
+class ImageTooLarge(ValueError):
+    """The image has more pixels than settings.IMAGE_MAX_PIXELS allows."""
+
+
+def open_image(file, max_pixels=None):
+    """Open file without decoding its pixels; raise ImageTooLarge over the pixel budget."""
+    img = Image.open(file)
+    limit = max_pixels or getattr(settings, 'IMAGE_MAX_PIXELS', DEFAULT_MAX_PIXELS)
+    if img.width * img.height > limit:
+        raise ImageTooLarge(f'{img.width}x{img.height} image exceeds the {limit} pixel limit')
+    return img
+
+
+def displayed_size(img):
+    """(width, height) of img once EXIF rotation is applied."""
+    if img.getexif().get(_EXIF_ORIENTATION) in _TRANSPOSED:
+        return img.height, img.width
+    return img.size
+
+
+def decode_image(img, min_size=None):
+    """Decode an opened image upright, at the smallest JPEG scale still covering min_size.
+
+    min_size is in displayed orientation; other formats are decoded at full size.
     """
-    Crop/resize image to target aspect ratio (e.g. 16:9).
-    Modifies the image_field in place.
+    if min_size:
+        if img.getexif().get(_EXIF_ORIENTATION) in _TRANSPOSED:
+            min_size = min_size[::-1]
+        img.draft('RGB', min_size)
+    img.load()
+    ImageOps.exif_transpose(img, in_place=True)
+    return img
+
+
+def _orient(img, orientation):
+    """Apply an EXIF orientation to an image that no longer carries its EXIF data."""
+    method = {
+        2: Image.Transpose.FLIP_LEFT_RIGHT, 3: Image.Transpose.ROTATE_180, 4: Image.Transpose.FLIP_TOP_BOTTOM,
+        5: Image.Transpose.TRANSPOSE, 6: Image.Transpose.ROTATE_270, 7: Image.Transpose.TRANSVERSE,
+        8: Image.Transpose.ROTATE_90,
+    }.get(orientation)
+    return img.transpose(method) if method is not None else img
+
+
+def crop_to_aspect_ratio(file, target_ratio='16:9', quality=85, max_width=None):
+    """Centre-crop file to target_ratio, no wider than max_width, as a JPEG.
+
+    Returns a temporary file positioned at 0 (caller closes it), or None if the
+    image already has the ratio and fits.
     """
-    if not image_field:
-        return
-    try:
-        img = Image.open(image_field).convert('RGB')
-    except Exception:
-        return
-    w, h = img.size
     target_w, target_h = map(int, target_ratio.split(':'))
-    current_ratio = w / h
     target_ratio_val = target_w / target_h
+    max_width = max_width or getattr(settings, 'IMAGE_MAX_WIDTH', DEFAULT_MAX_WIDTH)
 
-    if abs(current_ratio - target_ratio_val) < 0.01:
+    img = open_image(file)
+    orientation = img.getexif().get(_EXIF_ORIENTATION)
+    w, h = displayed_size(img)
+    if abs(w / h - target_ratio_val) < 0.01:
         # Already close enough
-        return
-
-    if current_ratio > target_ratio_val:
+        crop_w, crop_h = w, h
+        if w <= max_width:
+            return None
+    elif w / h > target_ratio_val:
         # Image is wider - crop width
-        new_w = int(h * target_ratio_val)
-        left = (w - new_w) // 2
-        img = img.crop((left, 0, left + new_w, h))
+        crop_w, crop_h = int(h * target_ratio_val), h
     else:
         # Image is taller - crop height
-        new_h = int(w / target_ratio_val)
-        top = (h - new_h) // 2
-        img = img.crop((0, top, w, top + new_h))
-
-    output = io.BytesIO()
-    fmt = 'JPEG'  # Use JPEG for smaller size
-    save_kw = {'format': fmt, 'quality': quality, 'optimize': True}
-    img.save(output, **save_kw)
+        crop_w, crop_h = w, int(w / target_ratio_val)
+    out_w = min(crop_w, max_width)
+    out_h = max(round(crop_h * out_w / crop_w), 1)
+    scale = out_w / crop_w
+
+    # Crop and shrink in stored orientation, rotate only the small result
+    if orientation in _TRANSPOSED:
+        w, h, crop_w, crop_h, out_w, out_h = h, w, crop_h, crop_w, out_h, out_w
+    img.draft('RGB', (math.ceil(w * scale), math.ceil(h * scale)))
+    img.load()
+    # Draft mode may have decoded at 1/2, 1/4 or 1/8 size
+    dw, dh = img.size
+    crop_w, crop_h = round(crop_w * dw / w), round(crop_h * dh / h)
+    left, top = (dw - crop_w) // 2, (dh - crop_h) // 2
+    box = (left, top, left + crop_w, top + crop_h)
+    if (crop_w, crop_h) == (out_w, out_h):
+        img = img.crop(box)
+    else:
+        # Resample straight from the crop box, no intermediate cropped copy
+        img = img.resize((out_w, out_h), Image.LANCZOS, box=box)
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+    img = _orient(img, orientation)
+
+    output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    img.save(output, format='JPEG', quality=quality, optimize=True)
     output.seek(0)
-    name = image_field.name.rsplit('.', 1)[0] + '.jpg'
-    image_field.save(name, ContentFile(output.read()), save=False)
+    return output
+
+
+def process_image_to_aspect_ratio(image_field, target_ratio='16:9', quality=85):
+    """
+    Crop/resize image to target aspect ratio (e.g. 16:9).
+    Modifies the image_field in place. Raises ImageTooLarge over the pixel budget.
+    """
+    if not image_field:
+        return
+    try:
+        image_field.open('rb')
+        output = crop_to_aspect_ratio(image_field, target_ratio, quality)
+    except UnidentifiedImageError:
+        return
+    finally:
+        image_field.close()
+    if output is None:
+        return
+    # FieldFile.save() applies upload_to again, so pass only the file name
+    name = os.path.splitext(os.path.basename(image_field.name))[0] + '.jpg'
+    with output:
+        image_field.save(name, File(output), save=False)
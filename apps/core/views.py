@@ -1,31 +1,35 @@
 import json
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
 from django.shortcuts import render
 from django.utils import timezone
-from django.db.models import Q, Case, When, Value, IntegerField
-from .models import HeroBanner, HomeContent, AnnouncementPopup, GalleryImage
+from django.utils.cache import patch_vary_headers
+from django.views.static import serve
+from .announcements import active_announcements, active_announcements_change_at, seconds_until
+from .cache import home_page_cache_key
+from .storage import is_content_addressed
+from .thumbnails import allowed_sizes, choose_format, content_type, get_thumbnail
+from .models import HeroBanner, HomeContent, GalleryImage
 from apps.programs.models import Program
 from apps.team.models import Collaboration
 
 
-def home(request):
+def _home_page_cacheable(request):
+    """Only anonymous, plain GETs with no flash messages share the cached page."""
+    if request.method != 'GET' or request.GET:
+        return False
+    if request.user.is_authenticated:
+        return False
+    return len(get_messages(request)) == 0
+
+
+def _render_home(request, now):
     banners = HeroBanner.objects.filter(is_active=True)
     contents = {c.key: c for c in HomeContent.objects.filter(is_active=True)}
-    now = timezone.now()
-    announcements = AnnouncementPopup.objects.filter(
-        status='published', is_active=True
-    ).filter(
-        Q(start_date__isnull=True) | Q(start_date__lte=now)
-    ).filter(
-        Q(end_date__isnull=True) | Q(end_date__gte=now)
-    ).annotate(
-        priority_order=Case(
-            When(priority='high', then=Value(0)),
-            When(priority='medium', then=Value(1)),
-            When(priority='low', then=Value(2)),
-            default=Value(1),
-            output_field=IntegerField()
-        )
-    ).order_by('priority_order', '-start_date', '-id')
+    announcements = active_announcements(now)
     gallery = GalleryImage.objects.filter(is_active=True)[:12]
     programs = Program.objects.all()[:6]
     collaborations = Collaboration.objects.filter(is_active=True).order_by('order', '-agreement_date', 'organization_name')
@@ -44,3 +48,55 @@ def home(request):
         'programs': programs,
         'collaborations': collaborations,
     })
+
+
+def home(request):
+    now = timezone.now()
+    if not _home_page_cacheable(request):
+        return _render_home(request, now)
+    key = home_page_cache_key()
+    cached = cache.get(key)
+    if cached is not None:
+        content, content_type = cached
+        return HttpResponse(content, content_type=content_type)
+    response = _render_home(request, now)
+    # Expire at the next announcement start/end so scheduled popups appear on time
+    timeout = getattr(settings, 'HOME_PAGE_CACHE_TIMEOUT', 300)
+    timeout = min(timeout, seconds_until(active_announcements_change_at(now), now, default=timeout))
+    cache.set(key, (response.content, response['Content-Type']), timeout)
+    return response
+
+
+def media(request, path):
+    """Serve MEDIA_ROOT; content-addressed names never change content, so they are cached for a year."""
+    response = serve(request, path, document_root=settings.MEDIA_ROOT)
+    if is_content_addressed(path):
+        response['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
+
+def thumbnail(request, width, height, path):
+    """/media/thumb/<w>x<h>/<path>: cached small rendition of a media image (0 = proportional)."""
+    # Whitelisted sizes only: each new size costs an encode and a slot in the LRU cache
+    if (width, height) not in allowed_sizes():
+        raise Http404('Unsupported thumbnail size')
+    fmt = choose_format(path, request.headers.get('Accept', ''))
+    # Second attempt covers the file being evicted between lookup and open
+    for _attempt in range(2):
+        try:
+            file = open(get_thumbnail(path, width, height, fmt), 'rb')
+            break
+        except FileNotFoundError:
+            continue
+        except (SuspiciousFileOperation, OSError, ValueError):
+            # Bad path, not an image, or over the pixel budget
+            raise Http404('No such image')
+    else:
+        raise Http404('No such image')
+    response = FileResponse(file, content_type=content_type(fmt))
+    if is_content_addressed(path):
+        response['Cache-Control'] = 'public, max-age=31536000, immutable'
+    else:
+        response['Cache-Control'] = 'public, max-age=86400'
+    patch_vary_headers(response, ['Accept'])
+    return response
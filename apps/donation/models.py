@@ -1,5 +1,7 @@
 from django.db import models
 
+from apps.core.models import FieldTrackerMixin
+
 
 class DonationTier(models.Model):
     """Donation amount tiers"""
@@ -31,8 +33,9 @@ class BankDetail(models.Model):
         return f'{self.bank_name} - {self.account_number}'
 
 
-class Donation(models.Model):
+class Donation(FieldTrackerMixin):
     """Donation records"""
+    tracked_fields = ('status',)
     STATUS_CHOICES = [
         ('pending', 'Pending'),
         ('completed', 'Completed'),
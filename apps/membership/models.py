@@ -1,5 +1,7 @@
 from django.db import models
 
+from apps.core.models import FieldTrackerMixin
+
 
 class MembershipFee(models.Model):
     """Editable membership fees"""
@@ -15,8 +17,10 @@ class MembershipFee(models.Model):
         return f'{self.get_member_type_display()}: NPR {self.amount}'
 
 
-class VolunteerApplication(models.Model):
+class VolunteerApplication(FieldTrackerMixin):
     """Volunteer application form submissions"""
+    # Status plus the fields copied to the public Member entry on approval
+    tracked_fields = ('status', 'name', 'email', 'contact_number', 'profile_image')
     name = models.CharField(max_length=200)
     contact_number = models.CharField(max_length=50)
     email = models.EmailField()
@@ -35,8 +39,9 @@ class VolunteerApplication(models.Model):
         return self.name
 
 
-class MembershipApplication(models.Model):
+class MembershipApplication(FieldTrackerMixin):
     """Membership application form submissions"""
+    tracked_fields = ('status', 'name', 'email', 'phone')
     MEMBER_TYPE_CHOICES = [
         ('general', 'General Member'),
         ('active', 'Active Member'),
@@ -1,7 +1,17 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class TeamConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.team'
     verbose_name = 'Team Directory'
+
+    def ready(self):
+        post_migrate.connect(_ensure_search_index, sender=self, dispatch_uid='team_search_index')
+
+
+def _ensure_search_index(sender, using='default', **kwargs):
+    # Table rebuilds in later migrations drop the FTS triggers; put them back
+    from .search import ensure_search_index
+    ensure_search_index(using, create=False)
@@ -0,0 +1,71 @@
+"""Compact JSON index of active members for searching the team page in the browser.
+
+Served from /team/index/<hash>.json: the URL changes whenever the content does,
+so browsers may cache it forever. Rebuilt once per team directory version
+(any Member, Chapter or Location change). Only offered while the directory has
+at most TEAM_CLIENT_INDEX_MAX_MEMBERS active members; beyond that the page
+searches through the server endpoints.
+
+Body: {"fields": [...], "members": [[...], ...]}, one row per member in
+directory order, values in "fields" order.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.core.cache import get_team_directory_version, team_fragment_cache_key
+from apps.core.images import best_rendition_url, srcset
+
+from .locations import location_name
+from .models import Member
+
+DEFAULT_MAX_MEMBERS = 2000
+FIELDS = (
+    'id', 'type', 'name', 'role', 'member_id', 'specialization', 'location', 'location_name', 'chapter',
+    'initials', 'photo', 'facebook', 'instagram', 'linkedin', 'email',
+)
+
+
+def max_members():
+    return getattr(settings, 'TEAM_CLIENT_INDEX_MAX_MEMBERS', DEFAULT_MAX_MEMBERS)
+
+
+def _photo(member):
+    """[src, webp srcset, jpeg srcset, width, height, colour] for a card image, or None."""
+    if not member.photo:
+        return None
+    data = member.renditions_for('photo')
+    if not data:
+        return [member.photo.url, '', '', None, None, '']
+    color = '' if data.get('alpha') else data.get('color', '')
+    return [best_rendition_url(data, 960), srcset(data, 'webp'), srcset(data, 'jpeg'),
+            data.get('width'), data.get('height'), color]
+
+
+def _row(member):
+    return [
+        member.pk, member.member_type, member.name, member.role, member.member_id or '', member.specialization,
+        member.location, location_name(member.location), member.chapter_id, member.initials, _photo(member),
+        member.facebook_url, member.instagram_url, member.linkedin_url, member.email or '',
+    ]
+
+
+def build_index():
+    members = Member.objects.filter(is_active=True).order_by('order', 'name', 'pk').only(
+        'name', 'role', 'member_type', 'member_id', 'specialization', 'location', 'chapter_id', 'photo',
+        'renditions', 'facebook_url', 'instagram_url', 'linkedin_url', 'email',
+    )
+    return {'fields': FIELDS, 'members': [_row(m) for m in members.iterator(chunk_size=500)]}
+
+
+def member_index():
+    """(hash, JSON bytes) of the current index, built once per team directory version."""
+    key = team_fragment_cache_key('client-index', get_team_directory_version())
+    cached = cache.get(key)
+    if cached is None:
+        body = json.dumps(build_index(), separators=(',', ':')).encode()
+        cached = (hashlib.sha256(body).hexdigest()[:16], body)
+        cache.set(key, cached, getattr(settings, 'TEAM_FRAGMENT_CACHE_TIMEOUT', 600))
+    return cached
@@ -0,0 +1,45 @@
+"""Per-process registry of volunteer Locations: code -> name lookups without a query per card.
+
+Loaded with one query on first use and dropped when a Location is saved or
+deleted (core signals), or when another worker bumps the content version.
+"""
+from apps.core.cache import register_local_cache
+
+_registry = None
+
+
+def _registry_data():
+    global _registry
+    registry = _registry
+    if registry is None:
+        from .models import Location
+        rows = list(Location.objects.order_by('order', 'name').values_list('code', 'name', 'is_active'))
+        registry = {
+            'names': {code: name for code, name, _active in rows},
+            'active': [(code, name) for code, name, active in rows if active],
+        }
+        registry['active_codes'] = frozenset(code for code, _name in registry['active'])
+        _registry = registry
+    return registry
+
+
+def location_name(code):
+    """Display name for a location code (inactive locations included); the code itself if unknown."""
+    if not code:
+        return ''
+    return _registry_data()['names'].get(code, code)
+
+
+def active_locations():
+    """(code, name) of active locations in display order, for the volunteer filter tabs."""
+    return list(_registry_data()['active'])
+
+
+def active_location_codes():
+    return _registry_data()['active_codes']
+
+
+@register_local_cache
+def clear_location_registry():
+    global _registry
+    _registry = None
@@ -1,29 +1,30 @@
+import time
+
 from django.core.management.base import BaseCommand
-from django.db import models
-from apps.team.models import Member
+from apps.team.member_ids import apply_member_ids, plan_member_ids
 
 
 class Command(BaseCommand):
-    help = 'Generate member IDs for all members that are missing them'
+    help = 'Generate member IDs for all members that are missing them (or renumber everyone with --renumber)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--renumber', action='store_true',
+                            help='Re-ID every member 1..n per type and year in directory order')
+        parser.add_argument('--dry-run', action='store_true', help='Only print the ID changes')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per bulk UPDATE (default 1000)')
 
     def handle(self, *args, **options):
-        members_without_id = Member.objects.filter(
-            models.Q(member_id__isnull=True) | models.Q(member_id='')
-        )
-        
-        count = 0
-        for member in members_without_id:
-            if not member.member_id or member.member_id.strip() == '':
-                old_id = member.member_id
-                member.member_id = member.generate_member_id()
-                member.save(update_fields=['member_id'])
-                count += 1
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f'Generated ID for {member.name}: {old_id} -> {member.member_id}'
-                    )
-                )
-        
-        self.stdout.write(
-            self.style.SUCCESS(f'\nSuccessfully generated {count} member IDs.')
-        )
+        start = time.monotonic()
+        if options['dry_run']:
+            changes, _last_values = plan_member_ids(options['renumber'])
+        else:
+            changes = apply_member_ids(options['renumber'], batch_size=options['batch_size'])
+        for _pk, name, old_id, new_id in changes:
+            self.stdout.write(f'{name}: {old_id or "(none)"} -> {new_id}')
+        elapsed = time.monotonic() - start
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(
+                f'\n{len(changes)} member IDs would change ({elapsed:.1f}s). Run without --dry-run to apply.'
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'\nSuccessfully updated {len(changes)} member IDs in {elapsed:.1f}s.'))
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from apps.team.member_import import BATCH_SIZE, MemberImportError, import_members
+
+
+class Command(BaseCommand):
+    help = 'Import members from a CSV or XLSX file (same rules as CMS → Members → Import)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='.csv (UTF-8) or .xlsx file; the first row names the columns')
+        parser.add_argument('--dry-run', action='store_true', help='Validate and report without importing')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help=f'Rows per bulk INSERT (default {BATCH_SIZE})')
+
+    def handle(self, *args, **options):
+        start = time.monotonic()
+        with open(options['path'], 'rb') as f:
+            try:
+                result = import_members(f, dry_run=options['dry_run'], batch_size=options['batch_size'])
+            except MemberImportError as e:
+                raise CommandError(e)
+        for row_number, name, errors in result.errors:
+            self.stdout.write(f'Row {row_number} ({name or "no name"}): {"; ".join(errors)}')
+        if result.error_count > len(result.errors):
+            self.stdout.write(f'... and {result.error_count - len(result.errors)} more rows with errors')
+        elapsed = time.monotonic() - start
+        summary = f'{result.created} members, {result.error_count} rows skipped ({elapsed:.1f}s).'
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'\nWould import {summary} Run without --dry-run to apply.'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'\nImported {summary}'))
@@ -0,0 +1,85 @@
+"""Bulk member ID assignment: one ordered scan, batched UPDATEs, one transaction.
+
+Numbers are per member type and year, in directory order (order, pk) - the
+same scheme Member.generate_member_id uses for single saves.
+"""
+from django.db import connection, transaction
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.core.cache import bump_content_version
+from .models import Member, MemberIdSequence, format_member_id
+
+
+def _scan(queryset, chunk_size):
+    """Stream (pk, name, member_type, year, member_id) grouped by type/year, in directory order."""
+    # Members without join_year are numbered in the current year, as in generate_member_id
+    rows = queryset.annotate(
+        id_year=Coalesce('join_year', Value(timezone.now().year))
+    ).order_by('member_type', 'id_year', 'order', 'pk').values_list(
+        'pk', 'name', 'member_type', 'id_year', 'member_id'
+    ).iterator(chunk_size=chunk_size)
+    for pk, name, member_type, year, member_id in rows:
+        yield pk, name, member_type, year, member_id or ''
+
+
+def plan_member_ids(renumber=False, chunk_size=2000):
+    """Compute ID changes without writing.
+
+    renumber=False: only members without an ID, numbered after each sequence's current value.
+    renumber=True: every member, numbered 1..n within each type/year.
+    Returns (changes, last_values): changes is a list of (pk, name, old_id, new_id) for
+    IDs that differ, last_values maps (member_type, year) to the sequence value afterwards.
+    """
+    queryset = Member.objects.all()
+    if not renumber:
+        queryset = queryset.filter(member_id='') | queryset.filter(member_id__isnull=True)
+    counters = {}
+    changes = []
+    for pk, name, member_type, year, old_id in _scan(queryset, chunk_size):
+        key = (member_type, year)
+        if key not in counters:
+            counters[key] = 0 if renumber else MemberIdSequence.peek(member_type, year)
+        counters[key] += 1
+        new_id = format_member_id(member_type, counters[key], year)
+        if new_id != old_id:
+            changes.append((pk, name, old_id, new_id))
+    return changes, counters
+
+
+def apply_member_ids(renumber=False, batch_size=1000):
+    """Assign IDs as plan_member_ids() describes, atomically. Returns the list of changes."""
+    with transaction.atomic():
+        # Hold the sequence rows so concurrent saves wait instead of taking numbers we are assigning
+        list(MemberIdSequence.objects.select_for_update())
+        changes, last_values = plan_member_ids(renumber)
+        if not renumber:
+            # Reserve the numbers used; the plan started from each sequence's current value
+            for (member_type, year), last in last_values.items():
+                MemberIdSequence.allocate(member_type, year, count=last - MemberIdSequence.peek(member_type, year))
+        else:
+            for (member_type, year), last in last_values.items():
+                MemberIdSequence.objects.update_or_create(
+                    member_type=member_type, year=year, defaults={'last_value': last}
+                )
+        _write_ids(changes, batch_size)
+    if changes:
+        # Raw UPDATEs send no post_save: have every worker drop its team fragments and typeahead index
+        bump_content_version()
+    return changes
+
+
+def _write_ids(changes, batch_size):
+    """Batched single-column UPDATE by pk.
+
+    QuerySet.bulk_update() builds a CASE expression per row, which costs ~30s
+    for 100k members; executemany() with a prepared UPDATE takes under a second.
+    """
+    quote = connection.ops.quote_name
+    sql = 'UPDATE {} SET {} = %s WHERE {} = %s'.format(
+        quote(Member._meta.db_table), quote(Member._meta.get_field('member_id').column), quote(Member._meta.pk.column),
+    )
+    with connection.cursor() as cursor:
+        for i in range(0, len(changes), batch_size):
+            cursor.executemany(sql, [(new_id, pk) for pk, _name, _old, new_id in changes[i:i + batch_size]])
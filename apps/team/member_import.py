@@ -0,0 +1,353 @@
+"""Bulk member import from CSV or XLSX: streamed, validated per row, inserted in batches.
+
+The upload is read one row at a time (csv.reader, or an iterparse over the
+first worksheet), so memory stays flat however long the file is; only the
+current batch and the first MAX_REPORTED_ERRORS errors are kept. Each cell is
+cleaned by the MemberForm field of its column. Valid rows are inserted with
+batched INSERTs, and their member IDs are reserved per type and year with one
+MemberIdSequence.allocate() per batch instead of one per member.
+"""
+import csv
+import datetime
+import io
+import posixpath
+import re
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+from django import forms
+from django.core.exceptions import ValidationError
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from apps.core.cache import bump_content_version
+from .models import Chapter, Member, MemberIdSequence, format_member_id
+from .search import deferred_indexing
+
+BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 500
+# Importable columns; photos are added afterwards through the member form
+FIELDS = (
+    'name', 'role', 'member_type', 'bio', 'specialization', 'chapter', 'category', 'location', 'email',
+    'phone', 'education', 'join_year', 'date_of_issue', 'facebook_url', 'instagram_url', 'linkedin_url',
+    'is_active', 'order',
+)
+
+
+class MemberImportError(ValueError):
+    """The upload cannot be imported at all (unreadable file, unknown or missing columns)."""
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        self.error_count = 0
+        self.errors = []  # (row number, name, [messages]), at most MAX_REPORTED_ERRORS
+
+    def add_error(self, row_number, name, messages):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((row_number, name, messages))
+
+
+# --- Reading -----------------------------------------------------------------
+
+def read_rows(upload):
+    """Yield each row of a .csv or .xlsx upload as a list of strings (header row included)."""
+    name = (getattr(upload, 'name', '') or '').lower()
+    upload.seek(0)
+    if name.endswith('.xlsx') or upload.read(4) == b'PK\x03\x04':
+        upload.seek(0)
+        try:
+            yield from _xlsx_rows(upload)
+        except (zipfile.BadZipFile, KeyError, SyntaxError) as e:
+            raise MemberImportError(f'Not a readable .xlsx workbook ({e}).') from e
+        return
+    upload.seek(0)
+    text = io.TextIOWrapper(upload, encoding='utf-8-sig', newline='')
+    try:
+        yield from csv.reader(text)
+    except UnicodeDecodeError as e:
+        raise MemberImportError('CSV files must be UTF-8 encoded (in Excel: Save As → CSV UTF-8).') from e
+    except csv.Error as e:
+        raise MemberImportError(f'Not a readable CSV file ({e}).') from e
+    finally:
+        text.detach()
+
+
+_MAIN = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_REL = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_PKG_REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+_CELL_REF = re.compile(r'([A-Z]+)')
+
+
+def _first_sheet_path(archive):
+    """Path of the first worksheet in the workbook, following xl/workbook.xml and its rels."""
+    sheet = next(_iter_tag(archive, 'xl/workbook.xml', _MAIN + 'sheet'))
+    rel_id = sheet.get(_REL + 'id')
+    for rel in _iter_tag(archive, 'xl/_rels/workbook.xml.rels', _PKG_REL + 'Relationship'):
+        if rel.get('Id') == rel_id:
+            target = rel.get('Target')
+            return target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join('xl', target))
+    raise KeyError(rel_id)
+
+
+def _iter_tag(archive, path, tag):
+    with archive.open(path) as f:
+        for _event, elem in iterparse(f):
+            if elem.tag == tag:
+                yield elem
+
+
+def _shared_strings(archive):
+    # Kept in memory: cells refer to them by index (one entry per distinct string, not per cell)
+    if 'xl/sharedStrings.xml' not in archive.namelist():
+        return []
+    strings = []
+    for si in _iter_tag(archive, 'xl/sharedStrings.xml', _MAIN + 'si'):
+        strings.append(''.join(t.text or '' for t in si.iter(_MAIN + 't')))
+        si.clear()
+    return strings
+
+
+def _column_index(ref):
+    index = 0
+    for ch in _CELL_REF.match(ref).group(1):
+        index = index * 26 + ord(ch) - 64
+    return index - 1
+
+
+def _xlsx_rows(upload):
+    with zipfile.ZipFile(upload) as archive:
+        strings = _shared_strings(archive)
+        with archive.open(_first_sheet_path(archive)) as sheet:
+            sheet_data = None
+            for event, row in iterparse(sheet, events=('start', 'end')):
+                if event == 'start':
+                    if row.tag == _MAIN + 'sheetData':
+                        sheet_data = row
+                    continue
+                if row.tag != _MAIN + 'row':
+                    continue
+                values = []
+                for cell in row.iter(_MAIN + 'c'):
+                    kind = cell.get('t')
+                    if kind == 'inlineStr':
+                        value = ''.join(t.text or '' for t in cell.iter(_MAIN + 't'))
+                    else:
+                        v = cell.find(_MAIN + 'v')
+                        value = (v.text or '') if v is not None else ''
+                        if kind == 's' and value:
+                            value = strings[int(value)]
+                        elif kind == 'b':
+                            value = 'TRUE' if value == '1' else 'FALSE'
+                        elif kind is None and value.endswith('.0'):
+                            value = value[:-2]  # Whole numbers (years, order) stored as floats
+                    ref = cell.get('r')
+                    column = _column_index(ref) if ref else len(values)
+                    values.extend([''] * (column - len(values)))
+                    values.append(value)
+                # Detach the parsed row so the tree never grows past one row
+                sheet_data.remove(row)
+                yield values
+
+
+# --- Validation --------------------------------------------------------------
+
+def _header_key(text):
+    return re.sub(r'[^a-z0-9]+', '_', (text or '').strip().lower()).strip('_')
+
+
+def _column_names():
+    """Accepted header spellings -> field name: 'member_type', 'Member type', 'Facebook URL', ..."""
+    names = {}
+    for name in FIELDS:
+        names[_header_key(name)] = name
+        names[_header_key(str(Member._meta.get_field(name).verbose_name))] = name
+    names['type'] = 'member_type'
+    return names
+
+
+def map_header(header):
+    """Field name for each column of header (None for empty columns); MemberImportError if unusable."""
+    names = _column_names()
+    columns, unknown = [], []
+    for text in header:
+        key = _header_key(text)
+        if key and key not in names:
+            unknown.append(text.strip())
+        columns.append(names.get(key) if key else None)
+    if unknown:
+        raise MemberImportError(
+            f'Unknown column(s): {", ".join(unknown)}. Allowed: {", ".join(FIELDS)}.'
+        )
+    if 'name' not in columns:
+        raise MemberImportError('The file needs a "name" column.')
+    return columns
+
+
+# Serials Excel can show as a date: 1900-01-01 up to 9999-12-31
+_XLSX_SERIALS = (0, 2958466)
+
+
+def _parse_date(value):
+    """A date for ISO text or an XLSX date serial; other text is left to DateField's formats."""
+    if re.fullmatch(r'\d+(\.\d+)?', value) and _XLSX_SERIALS[0] < float(value) < _XLSX_SERIALS[1]:
+        # XLSX stores dates as days since 1899-12-30; longer digit runs (20240101) are ISO basic dates
+        return datetime.date(1899, 12, 30) + datetime.timedelta(days=float(value))
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        return value
+
+
+class RowValidator:
+    """Cleans one row with MemberForm's fields; the form is built once, not per row.
+
+    The chapter column takes a chapter name or ID and member_type takes either
+    the stored value or its label ('Board Member'), looked up in memory.
+    """
+
+    def __init__(self):
+        from apps.cms.forms import MemberForm
+        self.fields = MemberForm().fields
+        self.chapters = {}
+        for pk, name in Chapter.objects.values_list('pk', 'name'):
+            self.chapters[str(pk)] = pk
+            self.chapters[name.strip().lower()] = pk
+        self.member_types = {}
+        for value, label in Member.MEMBER_TYPE_CHOICES:
+            self.member_types[value] = value
+            self.member_types[label.lower()] = value
+
+    def clean(self, values):
+        """(cleaned data, {field: [messages]}) for a row given as {field: raw text}."""
+        data, errors = {}, {}
+        for name, raw in values.items():
+            raw = raw.strip()
+            field = self.fields[name]
+            if not raw:
+                if field.required:
+                    errors[name] = [str(field.error_messages['required'])]
+                continue  # Blank cells keep the model default
+            try:
+                if name == 'chapter':
+                    if raw.lower() not in self.chapters:
+                        raise ValidationError(f'Unknown chapter "{raw}".')
+                    data['chapter_id'] = self.chapters[raw.lower()]
+                    continue
+                if name == 'member_type':
+                    raw = self.member_types.get(raw.lower(), raw)
+                elif name == 'date_of_issue':
+                    raw = _parse_date(raw)
+                elif isinstance(field, forms.BooleanField):
+                    raw = raw.lower() not in ('0', 'false', 'no', 'n', 'off')
+                data[name] = field.clean(raw)
+            except ValidationError as e:
+                errors[name] = e.messages
+            except OverflowError:
+                errors[name] = [f'"{raw}" is out of range.']
+        return data, errors
+
+
+# --- Import ------------------------------------------------------------------
+
+def _assign_ids(rows, defaults):
+    """Give every row of the batch its member ID, reserving numbers with one allocate() per type/year."""
+    year_now = timezone.now().year
+    groups = {}
+    for row in rows:
+        member_type = row.get('member_type', defaults['member_type'])
+        groups.setdefault((member_type, row.get('join_year') or year_now), []).append(row)
+    for (member_type, year), group in groups.items():
+        last = MemberIdSequence.allocate(member_type, year, count=len(group))
+        for number, row in enumerate(group, start=last - len(group) + 1):
+            row['member_id'] = format_member_id(member_type, number, year)
+
+
+class _Inserter:
+    """Batched INSERT of field-value dicts through one prepared statement.
+
+    Like member_ids._write_ids: bulk_create() compiles every row through the
+    ORM, which costs several times the INSERT itself at tens of thousands of rows.
+    """
+
+    def __init__(self, using, batch_size):
+        self.batch_size = batch_size
+        self.connection = connections[using]
+        self.fields = [f for f in Member._meta.concrete_fields if not f.primary_key]
+        self.columns = {f.attname: (i, f) for i, f in enumerate(self.fields)}
+        # Defaults are converted once; only the imported values are converted per row
+        self.defaults = {f.attname: f.get_default() for f in self.fields}
+        self.default_params = [f.get_db_prep_save(f.get_default(), self.connection) for f in self.fields]
+        quote = self.connection.ops.quote_name
+        self.sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            quote(Member._meta.db_table),
+            ', '.join(quote(f.column) for f in self.fields),
+            ', '.join(['%s'] * len(self.fields)),
+        )
+        self.batch = []
+        self.created = 0
+
+    def add(self, data):
+        self.batch.append(data)
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.batch:
+            return
+        _assign_ids(self.batch, self.defaults)
+        params = []
+        for row in self.batch:
+            values = list(self.default_params)
+            for attname, value in row.items():
+                i, field = self.columns[attname]
+                values[i] = field.get_db_prep_save(value, self.connection)
+            params.append(values)
+        with self.connection.cursor() as cursor:
+            cursor.executemany(self.sql, params)
+        self.created += len(self.batch)
+        self.batch.clear()
+
+
+def import_members(upload, dry_run=False, batch_size=BATCH_SIZE):
+    """Import every valid row of a CSV/XLSX upload; invalid rows are skipped and reported.
+
+    The first row names the columns (see FIELDS; labels such as "Member type"
+    work too). Runs in one transaction; with dry_run nothing is kept, but the
+    result still counts and reports as if it were. Raises MemberImportError
+    when the file itself is unusable.
+    """
+    result = ImportResult()
+    rows = read_rows(upload)
+    header = next(rows, None)
+    if header is None:
+        raise MemberImportError('The file is empty.')
+    columns = map_header(header)
+    validator = RowValidator()
+    using = router.db_for_write(Member)
+    inserter = _Inserter(using, batch_size)
+    with transaction.atomic(using):
+        with deferred_indexing(using):
+            # Row 1 is the header, so data rows are numbered as a spreadsheet shows them
+            for row_number, row in enumerate(rows, start=2):
+                values = {name: row[i] if i < len(row) else '' for i, name in enumerate(columns) if name}
+                if not any(v.strip() for v in values.values()):
+                    continue
+                data, errors = validator.clean(values)
+                if errors:
+                    result.add_error(row_number, values.get('name', '').strip(), [
+                        f'{Member._meta.get_field(name).verbose_name}: {message}'
+                        for name, messages in errors.items() for message in messages
+                    ])
+                    continue
+                inserter.add(data)
+            inserter.flush()
+        result.created = inserter.created
+        if dry_run:
+            transaction.set_rollback(True, using)
+    if result.created and not dry_run:
+        # Raw INSERTs send no post_save: have every worker drop its team fragments and typeahead index
+        bump_content_version()
+    return result
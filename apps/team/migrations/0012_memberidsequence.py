@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('team', '0011_image_renditions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MemberIdSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('member_type', models.CharField(choices=[('board', 'Board Member'), ('volunteer', 'Volunteer')], max_length=20)),
+                ('year', models.PositiveIntegerField()),
+                ('last_value', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('member_type', 'year'), name='unique_member_id_sequence')],
+            },
+        ),
+    ]
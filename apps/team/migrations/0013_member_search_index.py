@@ -0,0 +1,22 @@
+from django.db import migrations
+
+
+def create_index(apps, schema_editor):
+    from apps.team.search import ensure_search_index
+    ensure_search_index(schema_editor.connection.alias)
+
+
+def drop_index(apps, schema_editor):
+    from apps.team.search import drop_search_index
+    drop_search_index(schema_editor.connection.alias)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('team', '0012_memberidsequence'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -1,7 +1,10 @@
-from django.db import models
-from django.db.models import Q
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
 from django.urls import reverse
 
+from apps.core.images import RenditionsMixin
+from apps.core.models import FieldTrackerMixin, SingletonModel
+
 
 class Chapter(models.Model):
     """Chapter for board members (filter tabs on team page)"""
@@ -30,8 +33,16 @@ class Location(models.Model):
         return self.name
 
 
-class Member(models.Model):
+def format_member_id(member_type, number, year):
+    """NHAFN-B-XXX-YYYY (Board) or NHAFN-M-XXX-YYYY (Volunteer)"""
+    prefix = 'B' if member_type == 'board' else 'M'
+    return f'NHAFN-{prefix}-{number:03d}-{year}'
+
+
+class Member(FieldTrackerMixin, RenditionsMixin):
     """Team member directory"""
+    rendition_fields = ('photo',)
+    tracked_fields = ('member_type',)
     MEMBER_TYPE_CHOICES = [
         ('board', 'Board Member'),
         ('volunteer', 'Volunteer'),
@@ -68,6 +79,10 @@ class Member(models.Model):
 
     class Meta:
         ordering = ['order', 'name']
+        indexes = [
+            # Directory order per type; keyset pagination seeks on it (team.pagination)
+            models.Index(fields=['member_type', 'order', 'name', 'id'], name='member_directory_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -87,68 +102,83 @@ class Member(models.Model):
     @property
     def location_display(self):
         """Display name for location (from Location model or fallback to code)."""
-        if not self.location:
-            return ''
-        loc = Location.objects.filter(code=self.location).first()
-        return loc.name if loc else self.location
+        from .locations import location_name
+        return location_name(self.location)
 
     def generate_member_id(self):
-        """Auto-generate member ID based on member type: NHAFN-B-XXX-YYYY (Board) or NHAFN-M-XXX-YYYY (Volunteer)"""
+        """Allocate the next member ID for this type and year: NHAFN-B-XXX-YYYY (Board) or NHAFN-M-XXX-YYYY (Volunteer)"""
         from django.utils import timezone
         current_year = self.join_year if self.join_year else timezone.now().year
-        
-        # Determine prefix based on member_type
-        if self.member_type == 'board':
-            prefix = 'B'  # Board Member
-        else:
-            prefix = 'M'  # Volunteer
-        
-        # Get all members of the same type, ordered by order field then pk (same as list display order)
-        same_type_members = Member.objects.filter(
-            member_type=self.member_type
-        ).order_by('order', 'pk')
-        
-        # Count how many members of this type exist (including this one)
-        # This gives us the position in the list
-        total_count = same_type_members.count()
-        
-        # If this member already exists in DB, find its position
-        if self.pk:
-            # Get all members before this one in the ordered list
-            position = same_type_members.filter(
-                Q(order__lt=self.order) | 
-                (Q(order=self.order) & Q(pk__lt=self.pk))
-            ).count() + 1
-        else:
-            # New member - position is total count + 1
-            position = total_count + 1
-        
-        return f'NHAFN-{prefix}-{position:03d}-{current_year}'
+        number = MemberIdSequence.allocate(self.member_type, current_year)
+        return format_member_id(self.member_type, number, current_year)
 
     def save(self, *args, **kwargs):
         # Auto-generate member_id if not set or empty, or if member_type changed
-        if self.pk:
-            # Check if member_type changed by comparing with existing instance
-            try:
-                old_instance = Member.objects.get(pk=self.pk)
-                if old_instance.member_type != self.member_type:
-                    # Member type changed - regenerate ID
-                    self.member_id = self.generate_member_id()
-                elif not self.member_id or self.member_id.strip() == '':
-                    # ID is missing - generate it
-                    self.member_id = self.generate_member_id()
-            except Member.DoesNotExist:
-                # New instance
-                if not self.member_id or self.member_id.strip() == '':
-                    self.member_id = self.generate_member_id()
-        else:
-            # New member - generate ID
-            if not self.member_id or self.member_id.strip() == '':
-                self.member_id = self.generate_member_id()
+        type_changed = not self._state.adding and self.has_changed('member_type')
+        if type_changed or not (self.member_id or '').strip():
+            self.member_id = self.generate_member_id()
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'member_id' not in update_fields:
+                kwargs['update_fields'] = [*update_fields, 'member_id']
         super().save(*args, **kwargs)
 
 
-class TeamPageSettings(models.Model):
+class MemberIdSequence(models.Model):
+    """Last member ID number handed out per member type and year (see Member.generate_member_id)."""
+    member_type = models.CharField(max_length=20, choices=Member.MEMBER_TYPE_CHOICES)
+    year = models.PositiveIntegerField()
+    last_value = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['member_type', 'year'], name='unique_member_id_sequence'),
+        ]
+
+    def __str__(self):
+        return f'{self.get_member_type_display()} {self.year}: {self.last_value}'
+
+    @classmethod
+    def _existing_max(cls, member_type, year):
+        """Highest number already used in member IDs of this type/year (seeds a new sequence)."""
+        prefix = format_member_id(member_type, 0, year).rsplit('-', 2)[0] + '-'
+        highest = 0
+        for member_id in Member.objects.filter(
+            member_id__startswith=prefix, member_id__endswith=f'-{year}'
+        ).values_list('member_id', flat=True).iterator():
+            number = member_id[len(prefix):-len(f'-{year}')]
+            if number.isdigit():
+                highest = max(highest, int(number))
+        return highest
+
+    @classmethod
+    def allocate(cls, member_type, year, count=1):
+        """Reserve count numbers for (member_type, year) and return the last one.
+
+        The increment is a single UPDATE, which row-locks the sequence until the
+        surrounding transaction ends, so concurrent saves never get the same number.
+        """
+        with transaction.atomic():
+            rows = cls.objects.filter(member_type=member_type, year=year)
+            if not rows.update(last_value=F('last_value') + count):
+                try:
+                    with transaction.atomic():
+                        cls.objects.create(
+                            member_type=member_type, year=year,
+                            last_value=cls._existing_max(member_type, year) + count,
+                        )
+                except IntegrityError:
+                    # Another transaction created it first
+                    rows.update(last_value=F('last_value') + count)
+            return rows.values_list('last_value', flat=True).get()
+
+    @classmethod
+    def peek(cls, member_type, year):
+        """Last number handed out for (member_type, year), without reserving anything."""
+        last = cls.objects.filter(member_type=member_type, year=year).values_list('last_value', flat=True).first()
+        return cls._existing_max(member_type, year) if last is None else last
+
+
+class TeamPageSettings(SingletonModel):
     """Singleton settings to control Team page UI from CMS."""
 
     ALIGN_CHOICES = [
@@ -287,11 +317,6 @@ class TeamPageSettings(models.Model):
         verbose_name = 'Team page settings'
         verbose_name_plural = 'Team page settings'
 
-    @classmethod
-    def get(cls):
-        obj, _ = cls.objects.get_or_create(pk=1)
-        return obj
-
     @classmethod
     def get_defaults(cls):
         """Return a dict of default field values for reset-to-default actions."""
@@ -340,8 +365,9 @@ class TeamPageSettings(models.Model):
         }
 
 
-class Collaboration(models.Model):
+class Collaboration(RenditionsMixin):
     """Collaboration / Partner Wings - MOUs, partnerships, affiliations"""
+    rendition_fields = ('logo', 'detail_background_image')
     PARTNERSHIP_TYPE_CHOICES = [
         ('mou', 'Memorandum of Understanding (MOU)'),
         ('academic', 'Academic Partner'),
@@ -0,0 +1,57 @@
+"""Keyset (cursor) pagination for the member directory, in (order, name, pk) order.
+
+A page is fetched with a row-value comparison against the last member of the
+previous page, which SQLite answers by seeking member_directory_idx. So page
+500 costs the same as page 1, and no COUNT is needed: one extra row is
+fetched to tell whether another page follows.
+"""
+import base64
+import json
+
+from django.db import connections
+
+PAGE_SIZE = 12
+
+
+class InvalidCursor(ValueError):
+    """A cursor that was not produced by encode_cursor (corrupted, truncated or tampered with)."""
+
+
+def encode_cursor(member):
+    data = json.dumps([member.order, member.name, member.pk], separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """(order, name, pk) from a cursor, or None if there is none; InvalidCursor if it is malformed."""
+    if not cursor:
+        return None
+    try:
+        order, name, pk = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(cursor) from e
+    if not (isinstance(order, int) and isinstance(name, str) and isinstance(pk, int)):
+        raise InvalidCursor(cursor)
+    return order, name, pk
+
+
+def keyset_page(queryset, cursor='', size=PAGE_SIZE):
+    """Members after cursor, in directory order. Returns (members, next_cursor); next_cursor is '' on the last page.
+
+    Raises InvalidCursor for a malformed cursor: starting over from page 1
+    would append members the client already shows.
+    """
+    queryset = queryset.order_by('order', 'name', 'pk')
+    after = decode_cursor(cursor)
+    if after is not None:
+        quote = connections[queryset.db].ops.quote_name
+        meta = queryset.model._meta
+        columns = ', '.join(
+            f'{quote(meta.db_table)}.{quote(meta.get_field(name).column)}' for name in ('order', 'name', 'id')
+        )
+        queryset = queryset.extra(where=[f'({columns}) > (%s, %s, %s)'], params=list(after))
+    members = list(queryset[:size + 1])
+    if len(members) <= size:
+        return members, ''
+    members = members[:size]
+    return members, encode_cursor(members[-1])
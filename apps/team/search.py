@@ -0,0 +1,146 @@
+"""Full-text search over the member directory (name, role, member ID, specialization).
+
+On SQLite the columns are indexed in an FTS5 table, team_member_fts, which
+triggers keep in sync. They fire for every write, including QuerySet.update()
+and the bulk ID writer. Each search word is matched as a prefix, and results
+are ranked by BM25. Other databases fall back to icontains.
+"""
+import operator
+import re
+from contextlib import contextmanager
+from functools import reduce
+
+from django.db import connections
+from django.db.models import Q
+
+FTS_TABLE = 'team_member_fts'
+COLUMNS = ('name', 'role', 'member_id', 'specialization')
+# BM25 column weights, in COLUMNS order: a name hit outranks a specialization hit
+WEIGHTS = (10.0, 4.0, 6.0, 1.0)
+
+_TRIGGERS = {
+    'ai': 'AFTER INSERT ON team_member BEGIN {insert} END',
+    'ad': 'AFTER DELETE ON team_member BEGIN {delete} END',
+    'au': 'AFTER UPDATE OF name, role, member_id, specialization ON team_member BEGIN {delete} {insert} END',
+}
+
+
+def _trigger_sql():
+    cols = ', '.join(COLUMNS)
+    insert = f'INSERT INTO {FTS_TABLE}(rowid, {cols}) VALUES (new.id, {", ".join("new." + c for c in COLUMNS)});'
+    delete = (f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {cols}) "
+              f"VALUES ('delete', old.id, {', '.join('old.' + c for c in COLUMNS)});")
+    return {
+        f'{FTS_TABLE}_{suffix}': body.format(insert=insert, delete=delete)
+        for suffix, body in _TRIGGERS.items()
+    }
+
+
+def ensure_search_index(using='default', create=True):
+    """Create the FTS table and its triggers if missing, rebuilding the index when either was.
+
+    Idempotent. The migration creates the index; after every migrate it is
+    called with create=False to restore triggers that SQLite dropped when a
+    schema change rebuilt team_member.
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT type, name FROM sqlite_master WHERE name LIKE %s", [FTS_TABLE + '%'])
+        existing = {name for _type, name in cursor.fetchall()}
+        missing = [name for name in (FTS_TABLE, *_trigger_sql()) if name not in existing]
+        if not missing or (FTS_TABLE in missing and not create):
+            return
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            f"{', '.join(COLUMNS)}, content='team_member', content_rowid='id', "
+            f"tokenize='unicode61 remove_diacritics 2', prefix='1 2 3')"
+        )
+        for name, body in _trigger_sql().items():
+            cursor.execute(f'CREATE TRIGGER IF NOT EXISTS {name} {body}')
+        # Rows written while a trigger was missing are not indexed; re-read the whole table
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def drop_search_index(using='default'):
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name in _trigger_sql():
+            cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+        cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+@contextmanager
+def deferred_indexing(using='default'):
+    """Index rows INSERTed inside the block with one statement at the end, not one trigger call each.
+
+    For bulk imports: the per-row insert trigger costs more than the INSERT
+    itself. Use inside a transaction, for blocks that only add rows: the
+    trigger is dropped for the duration, and if the block raises, the rollback
+    restores it.
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        yield
+        return
+    name = f'{FTS_TABLE}_ai'
+    cols = ', '.join(COLUMNS)
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT COALESCE(MAX(id), 0) FROM team_member')
+        (last_id,) = cursor.fetchone()
+        cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+    yield
+    with connection.cursor() as cursor:
+        cursor.execute(f'CREATE TRIGGER IF NOT EXISTS {name} {_trigger_sql()[name]}')
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE}(rowid, {cols}) SELECT id, {cols} FROM team_member WHERE id > %s',
+            [last_id],
+        )
+
+
+def normalize_search(text):
+    """The words of text, lowercased and single-spaced: texts that search alike normalize alike."""
+    return ' '.join(re.findall(r'\w+', text.lower()))
+
+
+def match_expression(text, columns=None):
+    """FTS5 query for text: every word must match as a prefix. '' if text has no words.
+
+    Words are quoted, so FTS syntax typed by users (AND, NEAR, *, :) is searched literally.
+    """
+    words = re.findall(r'\w+', text)
+    if not words:
+        return ''
+    expression = ' '.join(f'"{word}"*' for word in words)
+    if columns:
+        expression = '{%s} : (%s)' % (' '.join(columns), expression)
+    return expression
+
+
+def search_members(queryset, text, columns=None, rank=True):
+    """Filter a Member queryset to rows matching text, best matches first when rank is True.
+
+    columns limits the search to some of COLUMNS (e.g. ('role',) for the role filters).
+    The queryset's own ordering is kept as the tie-breaker after relevance.
+    """
+    expression = match_expression(text, columns)
+    if not expression:
+        return queryset
+    if connections[queryset.db].vendor != 'sqlite':
+        for word in re.findall(r'\w+', text):
+            queryset = queryset.filter(reduce(operator.or_, (Q(**{f'{c}__icontains': word}) for c in columns or COLUMNS)))
+        return queryset
+    table = queryset.model._meta.db_table
+    queryset = queryset.extra(
+        tables=[FTS_TABLE],
+        where=[f'{FTS_TABLE}.rowid = {table}.id', f'{FTS_TABLE} MATCH %s'],
+        params=[expression],
+    )
+    if rank:
+        weights = ', '.join(str(w) for w in WEIGHTS)
+        queryset = queryset.extra(select={'search_rank': f'bm25({FTS_TABLE}, {weights})'})
+        queryset = queryset.order_by('search_rank', *queryset.query.order_by)
+    return queryset
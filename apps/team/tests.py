@@ -0,0 +1,22 @@
+import datetime
+
+from django.test import TestCase
+
+from apps.team.member_import import RowValidator
+
+
+class ImportDateTests(TestCase):
+    """date_of_issue takes ISO text or an XLSX serial; nothing else may abort the import."""
+
+    def clean(self, text):
+        return RowValidator().clean({'name': 'Sita', 'date_of_issue': text})
+
+    def test_xlsx_serial_and_iso_dates(self):
+        self.assertEqual(self.clean('45292')[0]['date_of_issue'], datetime.date(2024, 1, 1))
+        self.assertEqual(self.clean('2024-01-01')[0]['date_of_issue'], datetime.date(2024, 1, 1))
+
+    def test_long_digit_runs_are_not_serials(self):
+        data, errors = self.clean('20240101')
+        self.assertEqual(data.get('date_of_issue'), datetime.date(2024, 1, 1))
+        data, errors = self.clean('99999999999')
+        self.assertIn('date_of_issue', errors)
@@ -0,0 +1,150 @@
+"""Per-process prefix index of active members for typeahead suggestions (team_suggest).
+
+Keys are the normalized name, member ID and role, plus each of their
+word-boundary suffixes ('gita ramson' and 'ramson' for Gita Ramson), kept in
+one sorted list. A lookup is a bisect to the first key starting with the query
+plus a bounded scan, so it never touches the database. The index is built
+with one query on first use, updated by Member signals (apps.core.signals)
+after each commit, and dropped when another worker bumps the content version.
+"""
+import bisect
+import re
+import threading
+import unicodedata
+
+from django.urls import reverse
+
+from apps.core.cache import register_local_cache
+
+# Key kinds, best first: the name from its start, a later word of the name, member ID, role
+NAME, NAME_WORD, MEMBER_ID, ROLE = range(4)
+DEFAULT_LIMIT = 8
+# Keys examined per suggestion wanted; bounds the scan for one-letter queries
+SCAN_FACTOR = 25
+
+_NON_WORD = re.compile(r'[\W_]+')
+
+_lock = threading.Lock()
+_index = None
+
+
+def normalize(text):
+    """Lowercase words without diacritics, single-spaced: 'Zöe  Ünique' -> 'zoe unique'."""
+    if not text:
+        return ''
+    if not text.isascii():
+        text = ''.join(ch for ch in unicodedata.normalize('NFKD', text) if not unicodedata.combining(ch))
+    return _NON_WORD.sub(' ', text.lower()).strip()
+
+
+def _keys(name, member_id, role):
+    keys = []
+    for kind, words in ((NAME, normalize(name).split()), (MEMBER_ID, normalize(member_id).split()),
+                        (ROLE, normalize(role).split())):
+        for i in range(len(words)):
+            keys.append((' '.join(words[i:]), NAME_WORD if kind == NAME and i else kind))
+    return keys
+
+
+def _suggestion(pk, member, url):
+    name, member_id, role, member_type = member
+    return {
+        'id': pk, 'name': name, 'member_id': member_id or '', 'role': role or '',
+        'type': member_type, 'url': f'{url[0]}{pk}{url[1]}',
+    }
+
+
+class _Index:
+    def __init__(self, rows):
+        self.members = {}  # pk -> (name, member_id, role, member_type)
+        self.entries = []  # sorted (key, kind, pk)
+        # Member detail URL split around the pk: reverse() per suggestion would dominate a lookup
+        head, _pk, tail = reverse('member_detail', args=[0]).rpartition('0')
+        self.url = (head, tail)
+        for row in rows:
+            self._add(*row, sort=False)
+        self.entries.sort()
+
+    def _add(self, pk, name, member_id, role, member_type, sort=True):
+        self.members[pk] = (name, member_id, role, member_type)
+        for key, kind in _keys(name, member_id, role):
+            if sort:
+                bisect.insort(self.entries, (key, kind, pk))
+            else:
+                self.entries.append((key, kind, pk))
+
+    def remove(self, pk):
+        member = self.members.pop(pk, None)
+        if member is None:
+            return
+        for key, kind in _keys(*member[:3]):
+            i = bisect.bisect_left(self.entries, (key, kind, pk))
+            if i < len(self.entries) and self.entries[i] == (key, kind, pk):
+                del self.entries[i]
+
+    def put(self, pk, name, member_id, role, member_type):
+        self.remove(pk)
+        self._add(pk, name, member_id, role, member_type)
+
+    def search(self, query, limit):
+        best = {}
+        i = bisect.bisect_left(self.entries, (query,))
+        for key, kind, pk in self.entries[i:i + limit * SCAN_FACTOR]:
+            if not key.startswith(query):
+                break
+            if pk not in best or kind < best[pk]:
+                best[pk] = kind
+        ranked = sorted(best.items(), key=lambda item: (item[1], self.members[item[0]][0].lower()))
+        return [(pk, self.members[pk]) for pk, _kind in ranked[:limit]]
+
+
+def _get_index():
+    global _index
+    index = _index
+    if index is None:
+        from .models import Member
+        rows = Member.objects.filter(is_active=True).values_list('pk', 'name', 'member_id', 'role', 'member_type')
+        index = _Index(rows)
+        with _lock:
+            if _index is None:
+                _index = index
+            index = _index
+    return index
+
+
+def suggest(text, limit=DEFAULT_LIMIT):
+    """Up to limit active members whose name, member ID or role has a word starting with text.
+
+    Each suggestion is {'id', 'name', 'member_id', 'role', 'type', 'url'}.
+    """
+    query = normalize(text)
+    if not query:
+        return []
+    index = _get_index()
+    with _lock:
+        found = index.search(query, limit)
+    return [_suggestion(pk, member, index.url) for pk, member in found]
+
+
+def update_member(member):
+    """Re-index one member after a save (no-op until the index is first used)."""
+    with _lock:
+        if _index is None:
+            return
+        if member.is_active:
+            _index.put(member.pk, member.name, member.member_id, member.role, member.member_type)
+        else:
+            _index.remove(member.pk)
+
+
+def remove_member(pk):
+    with _lock:
+        if _index is not None:
+            _index.remove(pk)
+
+
+@register_local_cache
+def clear_typeahead_index():
+    global _index
+    with _lock:
+        _index = None
@@ -5,6 +5,9 @@ urlpatterns = [
     path('', views.team_list, name='team_list'),
     path('board/filter/', views.team_board_filter, name='team_board_filter'),
     path('volunteers/filter/', views.team_volunteer_filter, name='team_volunteer_filter'),
+    path('search/', views.team_search, name='team_search'),
+    path('suggest/', views.team_suggest, name='team_suggest'),
+    path('index/<str:digest>.json', views.team_member_index, name='team_member_index'),
     path('<int:pk>/', views.member_detail, name='team_member_detail'),
     path('member/<int:pk>/', views.member_detail, name='member_detail'),
     path('collaborations/', views.collaboration_list, name='collaboration_list'),
@@ -1,54 +1,202 @@
-from django.shortcuts import render, get_object_or_404
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.shortcuts import redirect, render, get_object_or_404
+from django.urls import reverse
 from django.db.models import Q
 from django.core.paginator import Paginator
-from django.http import HttpResponse
-from .models import Member, Chapter, Location, Collaboration, TeamPageSettings
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, HttpResponseNotModified, JsonResponse
+from django.utils.http import parse_etags
+from django.views.decorators.http import require_GET
+from . import client_index
+from .locations import active_location_codes, active_locations
+from .models import Member, Chapter, Collaboration, TeamPageSettings
+from .pagination import InvalidCursor, decode_cursor, keyset_page
+from .search import normalize_search, search_members
+from .typeahead import DEFAULT_LIMIT, suggest
+from apps.core.cache import team_fragment_cache_key
 from apps.membership.forms import VolunteerApplicationForm, MembershipApplicationForm
 from apps.membership.models import MembershipFee
 
 
 def _location_choices():
     """Public location choices for volunteer tabs (from Location model)."""
-    return [(loc.code, loc.name) for loc in Location.objects.filter(is_active=True).order_by('order', 'name')]
+    return active_locations()
 
 
-def team_board_filter(request):
-    """Return board member cards HTML fragment for AJAX chapter filtering (no full page refresh)."""
+# Most cards a search returns per section (search results are not paged)
+SEARCH_LIMIT = 200
+
+
+def _cached_fragment(request, key, build, as_json=False):
+    """Card fragment response for a filter endpoint, cached per normalized filter key.
+
+    build() returns the JSON payload: {'html', 'next'} for one section. Entries
+    follow the team directory version (bumped when a Member, Chapter or
+    Location changes). The ETag is a hash of the payload, so every worker gives
+    the same content the same ETag, and a repeated tab switch is answered with
+    304 without a query or render. Single sections are sent as HTML with an
+    X-Next-Cursor header unless ?format=json.
+    """
+    digest = hashlib.sha1(repr(key).encode()).hexdigest()
+    as_json = as_json or request.GET.get('format') == 'json'
+    cache_key = team_fragment_cache_key(digest)
+    cached = cache.get(cache_key)
+    if cached is None:
+        payload = build()
+        content_hash = hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest()[:20]
+        cached = (content_hash, payload)
+        cache.set(cache_key, cached, getattr(settings, 'TEAM_FRAGMENT_CACHE_TIMEOUT', 600))
+    content_hash, payload = cached
+    etag = f'"{content_hash}{"-json" if as_json else ""}"'
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        response = HttpResponseNotModified()
+    else:
+        if as_json:
+            response = JsonResponse(payload)
+        else:
+            response = HttpResponse(payload['html'], content_type='text/html; charset=utf-8')
+            response['X-Next-Cursor'] = payload['next']
+    response['ETag'] = etag
+    # Revalidate every time: the ETag changes as soon as the directory does
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+
+def _filter_params(request):
+    """Normalized (chapter, location, search) from the query string; invalid values become ''."""
     chapter_id = request.GET.get('chapter', '').strip()
-    search = request.GET.get('search', '').strip()
+    location = request.GET.get('location', '').strip()
+    return (
+        chapter_id if chapter_id.isdigit() else '',
+        location if location in active_location_codes() else '',
+        normalize_search(request.GET.get('search', '')),
+    )
+
+
+def _board_queryset(chapter_id):
     board = Member.objects.filter(is_active=True, member_type='board').order_by('order', 'name')
-    if chapter_id and chapter_id.isdigit():
-        board = board.filter(chapter_id=int(chapter_id))
-    if search:
-        board = board.filter(
-            Q(name__icontains=search) |
-            Q(role__icontains=search) |
-            Q(member_id__icontains=search) |
-            Q(specialization__icontains=search)
-        )
-    board = list(board[:200])
-    html = render(request, 'team/partials/board_cards.html', {'board_members': board}).content.decode()
-    return HttpResponse(html, content_type='text/html; charset=utf-8')
+    return board.filter(chapter_id=int(chapter_id)) if chapter_id else board
 
 
-def team_volunteer_filter(request):
-    """Return volunteer cards HTML fragment for AJAX location filtering (no full page refresh)."""
-    location = request.GET.get('location', '').strip()
-    search = request.GET.get('search', '').strip()
+def _volunteer_queryset(location):
     volunteers = Member.objects.filter(is_active=True, member_type='volunteer').order_by('order', 'name')
-    valid_codes = {loc.code for loc in Location.objects.filter(is_active=True)}
-    if location and location in valid_codes:
-        volunteers = volunteers.filter(location=location)
-    if search:
-        volunteers = volunteers.filter(
-            Q(name__icontains=search) |
-            Q(role__icontains=search) |
-            Q(member_id__icontains=search) |
-            Q(specialization__icontains=search)
-        )
-    volunteers = list(volunteers[:200])
-    html = render(request, 'team/partials/volunteer_cards.html', {'volunteers': volunteers}).content.decode()
-    return HttpResponse(html, content_type='text/html; charset=utf-8')
+    return volunteers.filter(location=location) if location else volunteers
+
+
+def _board_html(request, board):
+    return render(request, 'team/partials/board_cards.html', {'board_members': board}).content.decode()
+
+
+def _volunteer_html(request, volunteers):
+    return render(request, 'team/partials/volunteer_cards.html', {'volunteers': volunteers}).content.decode()
+
+
+def team_board_filter(request):
+    """Return board member cards HTML fragment for AJAX chapter filtering (no full page refresh)."""
+    chapter_id, _location, search = _filter_params(request)
+
+    def build():
+        board = _board_queryset(chapter_id)
+        if search:
+            board = search_members(board, search)
+        return {'html': _board_html(request, list(board[:SEARCH_LIMIT])), 'next': ''}
+
+    return _cached_fragment(request, ('board', chapter_id, search), build)
+
+
+def team_volunteer_filter(request):
+    """Volunteer cards HTML fragment for AJAX location filtering, search and infinite scroll.
+
+    Without a search, cards come a page at a time: pass the previous response's
+    X-Next-Cursor as ?after= for the next page ('' after the last one). Searches
+    return up to SEARCH_LIMIT best matches at once. With ?format=json the
+    response is {"html": ..., "next": ...} instead.
+    """
+    _chapter_id, location, search = _filter_params(request)
+    after = '' if search else request.GET.get('after', '')
+    try:
+        decode_cursor(after)
+    except InvalidCursor:
+        return HttpResponseBadRequest('Invalid cursor.')
+
+    def build():
+        volunteers = _volunteer_queryset(location)
+        if search:
+            volunteers, next_cursor = list(search_members(volunteers, search)[:SEARCH_LIMIT]), ''
+        else:
+            volunteers, next_cursor = keyset_page(volunteers, after)
+        if not volunteers and after:
+            # Past the end of an infinite scroll: nothing to append, not the empty state
+            return {'html': '', 'next': ''}
+        return {'html': _volunteer_html(request, volunteers), 'next': next_cursor}
+
+    return _cached_fragment(request, ('volunteers', location, search, after), build)
+
+
+def team_search(request):
+    """Board and volunteer cards for the team page search box, in one JSON response.
+
+    {"board": html, "volunteers": html, "next": volunteer cursor}. A search is
+    evaluated once for both sections: a single ranked query over board members
+    in the selected chapter and volunteers in the selected location, read until
+    each section has SEARCH_LIMIT cards. Without a search it returns what the
+    two filter endpoints would.
+    """
+    chapter_id, location, search = _filter_params(request)
+
+    def build():
+        if not search:
+            volunteers, next_cursor = keyset_page(_volunteer_queryset(location))
+            board = list(_board_queryset(chapter_id)[:SEARCH_LIMIT])
+        else:
+            board_q = Q(member_type='board', chapter_id=int(chapter_id)) if chapter_id else Q(member_type='board')
+            volunteer_q = Q(member_type='volunteer', location=location) if location else Q(member_type='volunteer')
+            matches = search_members(
+                Member.objects.filter(board_q | volunteer_q, is_active=True).order_by('order', 'name'), search
+            )
+            found = {'board': [], 'volunteer': []}
+            for member in matches.iterator(chunk_size=100):
+                if len(found[member.member_type]) < SEARCH_LIMIT:
+                    found[member.member_type].append(member)
+                elif all(len(cards) >= SEARCH_LIMIT for cards in found.values()):
+                    break
+            board, volunteers, next_cursor = found['board'], found['volunteer'], ''
+        return {
+            'board': _board_html(request, board),
+            'volunteers': _volunteer_html(request, volunteers),
+            'next': next_cursor,
+        }
+
+    return _cached_fragment(request, ('search', chapter_id, location, search), build, as_json=True)
+
+
+@require_GET
+def team_suggest(request):
+    """Typeahead suggestions for the team search box: {"results": [...]}, from the in-process index."""
+    try:
+        limit = min(max(int(request.GET.get('limit', DEFAULT_LIMIT)), 1), 20)
+    except ValueError:
+        limit = DEFAULT_LIMIT
+    return JsonResponse({'results': suggest(request.GET.get('q', ''), limit)})
+
+
+@require_GET
+def team_member_index(request, digest):
+    """Client-side search index (apps.team.client_index); immutable under its content hash."""
+    if Member.objects.filter(is_active=True).count() > client_index.max_members():
+        raise Http404('The directory is searched on the server.')
+    current, body = client_index.member_index()
+    if digest != current:
+        # A page rendered before the last change: send it to the current index
+        response = redirect('team_member_index', current)
+        response['Cache-Control'] = 'no-cache'
+        return response
+    response = HttpResponse(body, content_type='application/json')
+    response['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
 
 
 def team_list(request):
@@ -67,36 +215,27 @@ def team_list(request):
 
     # Volunteers: filter by location
     volunteer_qs = members_qs.filter(member_type='volunteer').order_by('order', 'name')
-    valid_codes = {loc.code for loc in Location.objects.filter(is_active=True)}
-    if location_filter and location_filter in valid_codes:
+    if location_filter and location_filter in active_location_codes():
         volunteer_qs = volunteer_qs.filter(location=location_filter)
 
-    # Paginate volunteers
-    paginator = Paginator(volunteer_qs, 12)
-    page_number = request.GET.get('page')
-    volunteer_page_obj = paginator.get_page(page_number)
+    # First page of volunteers; the rest load on scroll (team_volunteer_filter) or via ?after=
+    try:
+        volunteer_members, volunteer_next_cursor = keyset_page(volunteer_qs, request.GET.get('after', ''))
+    except InvalidCursor:
+        return HttpResponseBadRequest('Invalid cursor.')
 
-    # Build smart pagination range with ellipsis markers (None)
-    if paginator.num_pages <= 1:
-        volunteer_pagination_range = []
-    else:
-        current = volunteer_page_obj.number
-        pages = []
-        for n in [1, *range(current - 2, current + 3), paginator.num_pages]:
-            if 1 <= n <= paginator.num_pages and (not pages or n != pages[-1]):
-                pages.append(n)
-        volunteer_pagination_range = []
-        for n in pages:
-            if volunteer_pagination_range and n - volunteer_pagination_range[-1] > 1:
-                volunteer_pagination_range.append(None)
-            volunteer_pagination_range.append(n)
+    # Small directories are searched in the browser from a cached JSON index
+    member_index_url = ''
+    if member_count <= client_index.max_members():
+        member_index_url = reverse('team_member_index', args=[client_index.member_index()[0]])
 
     context = {
         'team_settings': team_settings,
         'members': members_qs,
         'board_members': board_members,
-        'volunteer_page_obj': volunteer_page_obj,
-        'volunteer_pagination_range': volunteer_pagination_range,
+        'volunteer_members': volunteer_members,
+        'volunteer_next_cursor': volunteer_next_cursor,
+        'member_index_url': member_index_url,
         'member_count': member_count,
         'chapters': Chapter.objects.filter(is_active=True).order_by('order', 'name'),
         'chapter_filter': chapter_filter,
@@ -40,6 +40,7 @@ MIDDLEWARE = [
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'apps.core.middleware.ContentVersionMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
@@ -75,6 +76,26 @@ STATICFILES_DIRS = [BASE_DIR / 'static'] if (BASE_DIR / 'static').exists() else
 
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# Uploads are named by content hash (deduplicated, immutable URLs); see apps.core.storage
+STORAGES = {
+    'default': {'BACKEND': 'apps.core.storage.ContentAddressedStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+# Widths (px) of the WebP/JPEG renditions generated for uploaded images (apps.core.images)
+IMAGE_RENDITION_WIDTHS = [320, 640, 960, 1280, 1920]
+# Uploads above this many pixels are rejected by image processing (bounds worker memory)
+IMAGE_MAX_PIXELS = int(os.environ.get('IMAGE_MAX_PIXELS', 50_000_000))
+# Hero banner crops are scaled down to at most this width
+IMAGE_MAX_WIDTH = 2560
+# On-demand thumbnails (/media/thumb/<w>x<h>/...): sizes the templates use (each 2x is allowed
+# too, other sizes 404), LRU disk cache location and cap
+THUMBNAIL_SIZES = [(36, 36), (44, 44), (0, 88)]
+THUMBNAIL_CACHE_DIR = BASE_DIR / 'cache' / 'thumbs'
+THUMBNAIL_CACHE_MAX_BYTES = int(os.environ.get('THUMBNAIL_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+# Image jobs (banner crops, renditions) run in a daemon thread of the web process;
+# set to 0 when running `manage.py process_image_jobs --loop` as a separate worker
+IMAGE_JOBS_IN_PROCESS = os.environ.get('IMAGE_JOBS_IN_PROCESS', '1') == '1'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -110,3 +131,16 @@ ESEWA_MERCHANT_ID = os.environ.get('ESEWA_MERCHANT_ID', 'EPAYTEST')
 ESEWA_SECRET_KEY = os.environ.get('ESEWA_SECRET_KEY', '8gBm/:&EnhH.1/q')
 KHALTI_SECRET_KEY = os.environ.get('KHALTI_SECRET_KEY', '')
 KHALTI_API_URL = os.environ.get('KHALTI_API_URL', 'https://a.khalti.com/api/v2/epayment/initiate/')
+
+# Global template context (nav, theme, identity, chat) is cached; invalidated on save/delete
+SITE_SETTINGS_CACHE_TIMEOUT = int(os.environ.get('SITE_SETTINGS_CACHE_TIMEOUT', 60 * 60 * 24))
+# Anonymous homepage render cache; also expires at the next announcement start/end
+HOME_PAGE_CACHE_TIMEOUT = int(os.environ.get('HOME_PAGE_CACHE_TIMEOUT', 300))
+# Seconds a rendered team filter fragment (chapter/location tab + search) stays cached
+TEAM_FRAGMENT_CACHE_TIMEOUT = int(os.environ.get('TEAM_FRAGMENT_CACHE_TIMEOUT', 600))
+# Largest directory (active members) the team page searches in the browser instead of on the server
+TEAM_CLIENT_INDEX_MAX_MEMBERS = int(os.environ.get('TEAM_CLIENT_INDEX_MAX_MEMBERS', 2000))
+# Seconds between per-worker checks of the shared content version (0 = every request). Other
+# workers may serve pre-edit content for up to this long after a CMS edit; the editing worker
+# drops its caches at once.
+CONTENT_VERSION_CHECK_INTERVAL = float(os.environ.get('CONTENT_VERSION_CHECK_INTERVAL', 5))
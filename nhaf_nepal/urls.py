@@ -1,12 +1,15 @@
 """
 URL configuration for NHAF Nepal project.
 """
+import re
+
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
 from apps.contact import views as contact_views
+from apps.core import views as core_views
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -21,8 +24,9 @@ urlpatterns = [
     path('contact/', include('apps.contact.urls')),
     path('donate/', include('apps.donation.urls')),
     path('ckeditor/', include('ckeditor_uploader.urls')),
+    path(settings.MEDIA_URL.lstrip('/') + 'thumb/<int:width>x<int:height>/<path:path>', core_views.thumbnail, name='thumbnail'),
 ]
 
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    urlpatterns += [re_path(r'^%s(?P<path>.*)$' % re.escape(settings.MEDIA_URL.lstrip('/')), core_views.media)]
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)